@@ -3,7 +3,11 @@ from pathlib import Path
 import sys
 
 # Add the project root to the path
-sys.path.insert(0, str(Path(__file__).parent))
+_ROOT = str(Path(__file__).resolve().parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from utils.style import inject_css
 
 # Page configuration
 st.set_page_config(
@@ -14,41 +18,11 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #2E7D32;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .info-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        color: white;
-        margin: 1rem 0;
-    }
-    .stButton>button {
-        background-color: #4CAF50;
-        color: white;
-        font-size: 1.1rem;
-        padding: 0.5rem 2rem;
-        border-radius: 5px;
-        border: none;
-    }
-    .stButton>button:hover {
-        background-color: #45a049;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_css("home")
 
 # Initialize session state
 if 'user_name' not in st.session_state:
     st.session_state.user_name = ""
-if 'business_data' not in st.session_state:
-    st.session_state.business_data = {}
 if 'game_score' not in st.session_state:
     st.session_state.game_score = 0
 if 'game_round' not in st.session_state:
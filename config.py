@@ -2,6 +2,12 @@
 Configuration file for Rural Business Simulator
 """
 
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
 # Business Types Configuration
 BUSINESS_TYPES = {
     "Dairy Farming": {
@@ -66,6 +72,18 @@ BUSINESS_TYPES = {
     }
 }
 
+# Freeze the business catalogue; it is shared by every session and must not be mutated
+BUSINESS_TYPES = MappingProxyType({
+    name: MappingProxyType({
+        **info,
+        "initial_resources": MappingProxyType({
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in info["initial_resources"].items()
+        })
+    })
+    for name, info in BUSINESS_TYPES.items()
+})
+
 # Language Configuration
 SUPPORTED_LANGUAGES = {
     "English": "en",
@@ -169,10 +187,11 @@ AUCTION_SETTINGS = {
     "min_bid_increment": 100,
     "auction_duration": 60,  # seconds
     "starting_price_factor": 0.7,  # 70% of market value
+    "refresh_ttl": 5,  # seconds the active auction list is cached between reruns
     "types": ["livestock", "equipment", "land", "inventory"]
 }
 
-# UI Theme
+# UI Theme (widget colors are applied through .streamlit/config.toml)
 UI_THEME = {
     "primary_color": "#4CAF50",
     "secondary_color": "#2196F3",
@@ -184,14 +203,10 @@ UI_THEME = {
 }
 
 # Prompt Templates
-SCENARIO_PROMPT_TEMPLATE = """
-Create a realistic business simulation scenario for a student running a {business_type} in {location}.
-
-Business Context:
-- Capital: ₹{capital}
-- Resources: {resources}
-- Employment: {employment_mode}
-- Current Round: {round_number}
+# Static instructions and schema, sent ahead of the per-business prompt so
+# providers can cache the shared prefix
+SCENARIO_SYSTEM_PREAMBLE = """
+You are a rural business education expert. Return only valid JSON.
 
 Generate a scenario that includes:
 1. A clear situation description (2-3 sentences)
@@ -203,22 +218,47 @@ Generate a scenario that includes:
 Make it educational, engaging, and reflective of real rural business challenges.
 
 Return ONLY a valid JSON object with this exact structure:
-{{
+{
   "scenario": "scenario description",
   "options": ["option 1", "option 2", "option 3"],
   "consequences": ["consequence 1", "consequence 2", "consequence 3"],
-  "score_logic": {{
-    "option_1": {{"risk": X, "reward": Y, "realism": Z}},
-    "option_2": {{"risk": X, "reward": Y, "realism": Z}},
-    "option_3": {{"risk": X, "reward": Y, "realism": Z}}
-  }},
-  "event": {{
+  "score_logic": {
+    "option_1": {"risk": X, "reward": Y, "realism": Z},
+    "option_2": {"risk": X, "reward": Y, "realism": Z},
+    "option_3": {"risk": X, "reward": Y, "realism": Z}
+  },
+  "event": {
     "description": "optional event description or null",
     "impact": "impact description or null"
-  }}
-}}
+  }
+}
 """
 
+# Per-business part of the scenario prompt
+SCENARIO_PROMPT_TEMPLATE = """
+Create a realistic business simulation scenario for a student running a {business_type} in {location}.
+
+Business Context:
+- Capital: ₹{capital}
+- Resources: {resources}
+- Employment: {employment_mode}
+- Current Round: {round_number}
+"""
+
+# The scenario template is split into (literal, field) pairs once at import,
+# so rendering is a plain join instead of re-parsing the format string
+_SCENARIO_PROMPT_PARTS = [
+    (literal, field)
+    for literal, field, _, _ in string.Formatter().parse(SCENARIO_PROMPT_TEMPLATE)
+]
+
+def render_scenario_prompt(**fields) -> str:
+    """Render SCENARIO_PROMPT_TEMPLATE; same result as SCENARIO_PROMPT_TEMPLATE.format(**fields)"""
+    return "".join(
+        literal + (str(fields[field]) if field else "")
+        for literal, field in _SCENARIO_PROMPT_PARTS
+    )
+
 TRANSLATION_PROMPT_TEMPLATE = """
 Translate the following business scenario text from English to {language}.
 Keep business terms clear and culturally appropriate.
@@ -228,3 +268,52 @@ Text to translate:
 
 Return only the translated text, no explanations.
 """
+
+BATCH_TRANSLATION_PROMPT_TEMPLATE = """
+Translate each numbered line below from English to {language}.
+Keep business terms clear and culturally appropriate.
+
+{lines}
+
+Return only the translated lines, each on its own line with the same number prefix, no explanations.
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class AppConfig:
+    """Read-only view of the settings above, shared by every page"""
+    business_types: Mapping
+    supported_languages: Mapping
+    scoring_weights: Mapping
+    score_thresholds: Mapping
+    dynamic_events: Tuple
+    ai_providers: Mapping
+    database_config: Mapping
+    game_settings: Mapping
+    auction_settings: Mapping
+    ui_theme: Mapping
+    scenario_system_preamble: str
+    scenario_prompt_template: str
+    translation_prompt_template: str
+    batch_translation_prompt_template: str
+
+
+@lru_cache(maxsize=None)
+def get_config() -> AppConfig:
+    """Build the shared AppConfig once per process"""
+    return AppConfig(
+        business_types=BUSINESS_TYPES,
+        supported_languages=MappingProxyType(SUPPORTED_LANGUAGES),
+        scoring_weights=MappingProxyType(SCORING_WEIGHTS),
+        score_thresholds=MappingProxyType(SCORE_THRESHOLDS),
+        dynamic_events=tuple(MappingProxyType(group) for group in DYNAMIC_EVENTS),
+        ai_providers=MappingProxyType({name: MappingProxyType(cfg) for name, cfg in AI_PROVIDERS.items()}),
+        database_config=MappingProxyType(DATABASE_CONFIG),
+        game_settings=MappingProxyType(GAME_SETTINGS),
+        auction_settings=MappingProxyType(AUCTION_SETTINGS),
+        ui_theme=MappingProxyType(UI_THEME),
+        scenario_system_preamble=SCENARIO_SYSTEM_PREAMBLE,
+        scenario_prompt_template=SCENARIO_PROMPT_TEMPLATE,
+        translation_prompt_template=TRANSLATION_PROMPT_TEMPLATE,
+        batch_translation_prompt_template=BATCH_TRANSLATION_PROMPT_TEMPLATE
+    )
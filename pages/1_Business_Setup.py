@@ -4,37 +4,97 @@ Business Setup Page - Create and configure your rural business
 
 import streamlit as st
 import sys
+from html import escape
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add parent directory to path; pages rerun on every interaction, so only once
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
-from config import BUSINESS_TYPES, SUPPORTED_LANGUAGES
-from utils.database import DatabaseManager
+from config import get_config
+from utils.resources import get_db, cached_get_user_businesses
+from utils.style import inject_css
+
+CFG = get_config()
+
+# Business type options and labels are static, so build them once at import
+_BIZ_KEYS = tuple(CFG.business_types.keys())
+_BIZ_LABELS = {k: f"{CFG.business_types[k]['icon']} {k}" for k in _BIZ_KEYS}
+
+# Existing businesses are rendered as one HTML table instead of a widget group per row
+_ROW_TMPL = (
+    "<tr><td>{label}</td><td>{location}</td><td>₹{capital:,}</td>"
+    "<td>{current_round}</td><td>{status}</td></tr>"
+)
+_TABLE_WRAPPER = (
+    '<table class="business-table">'
+    "<thead><tr><th>Business</th><th>Location</th><th>Capital</th><th>Round</th><th>Status</th></tr></thead>"
+    "<tbody>{rows}</tbody></table>"
+)
 
 st.set_page_config(page_title="Business Setup", page_icon="🏢", layout="wide")
 
 # Initialize database
-db = DatabaseManager()
+db = get_db()
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .business-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: white;
-        margin: 1rem 0;
-    }
-    .resource-box {
-        background: #f0f2f6;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 0.5rem 0;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_css("business_setup")
+
+def business_label(biz: dict) -> str:
+    """Icon, type and location label for an existing business"""
+    business_type = biz.get('business_type')
+    return f"{_BIZ_LABELS.get(business_type, f'🏢 {business_type}')} - {biz.get('location')}"
+
+@st.fragment
+def business_type_picker():
+    """Business type selector with its info card, resources and starting capital; reruns on its own when changed"""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Business Type Selection
+        st.markdown("#### Choose Your Business Type")
+        business_type = st.selectbox(
+            "Business Type",
+            options=_BIZ_KEYS,
+            format_func=_BIZ_LABELS.__getitem__,
+            key="setup_business_type"
+        )
+        
+        # Display business info
+        biz_info = CFG.business_types[business_type]
+        st.markdown(f"""
+        <div class="business-card">
+            <h3>{biz_info['icon']} {business_type}</h3>
+            <p><strong>Initial Capital:</strong> ₹{biz_info['initial_capital']:,}</p>
+            <p><strong>Revenue Model:</strong> {biz_info['revenue_model'].replace('_', ' ').title()}</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Kept here rather than in the form so the total follows the selected type
+        additional_capital = st.number_input(
+            "Additional Investment (₹)",
+            min_value=0,
+            max_value=500000,
+            value=0,
+            step=10000,
+            help="Any extra capital you want to invest",
+            key="setup_additional_capital"
+        )
+        
+        st.metric("Total Starting Capital", f"₹{biz_info['initial_capital'] + additional_capital:,}")
+    
+    with col2:
+        st.markdown("#### Initial Resources")
+        
+        # Display initial resources
+        st.markdown('<div class="resource-box">', unsafe_allow_html=True)
+        for resource, value in biz_info['initial_resources'].items():
+            if isinstance(value, (list, tuple)):
+                st.markdown(f"**{resource.replace('_', ' ').title()}:** {', '.join(value)}")
+            else:
+                st.markdown(f"**{resource.replace('_', ' ').title()}:** {value}")
+        st.markdown('</div>', unsafe_allow_html=True)
 
 def main():
     st.title("🏢 Business Setup")
@@ -54,31 +114,19 @@ def main():
             st.session_state.get('language', 'English')
         )
     
+    st.markdown("### 📋 Business Details")
+    
+    # The type preview sits outside the form so changing it reruns only the fragment
+    business_type_picker()
+    business_type = st.session_state.setup_business_type
+    biz_info = CFG.business_types[business_type]
+    total_capital = biz_info['initial_capital'] + st.session_state.setup_additional_capital
+    
     # Business Setup Form
     with st.form("business_setup"):
-        st.markdown("### 📋 Business Details")
-        
         col1, col2 = st.columns(2)
         
         with col1:
-            # Business Type Selection
-            st.markdown("#### Choose Your Business Type")
-            business_type = st.selectbox(
-                "Business Type",
-                options=list(BUSINESS_TYPES.keys()),
-                format_func=lambda x: f"{BUSINESS_TYPES[x]['icon']} {x}"
-            )
-            
-            # Display business info
-            biz_info = BUSINESS_TYPES[business_type]
-            st.markdown(f"""
-            <div class="business-card">
-                <h3>{biz_info['icon']} {business_type}</h3>
-                <p><strong>Initial Capital:</strong> ₹{biz_info['initial_capital']:,}</p>
-                <p><strong>Revenue Model:</strong> {biz_info['revenue_model'].replace('_', ' ').title()}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
             # Location
             location = st.text_input(
                 "Business Location",
@@ -94,30 +142,6 @@ def main():
             )
         
         with col2:
-            st.markdown("#### Initial Resources")
-            
-            # Display initial resources
-            st.markdown('<div class="resource-box">', unsafe_allow_html=True)
-            for resource, value in biz_info['initial_resources'].items():
-                if isinstance(value, list):
-                    st.markdown(f"**{resource.replace('_', ' ').title()}:** {', '.join(value)}")
-                else:
-                    st.markdown(f"**{resource.replace('_', ' ').title()}:** {value}")
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Additional Capital
-            additional_capital = st.number_input(
-                "Additional Investment (₹)",
-                min_value=0,
-                max_value=500000,
-                value=0,
-                step=10000,
-                help="Any extra capital you want to invest"
-            )
-            
-            total_capital = biz_info['initial_capital'] + additional_capital
-            st.metric("Total Starting Capital", f"₹{total_capital:,}")
-            
             # Investment Strategy
             st.markdown("#### Investment Priority")
             investment_priority = st.multiselect(
@@ -157,7 +181,7 @@ def main():
                 "location": location,
                 "employment_mode": employment_mode,
                 "capital": total_capital,
-                "resources": biz_info['initial_resources'],
+                "resources": dict(biz_info['initial_resources']),
                 "investment_priority": investment_priority,
                 "revenue_goal": monthly_revenue_goal,
                 "timeline": timeline,
@@ -165,10 +189,11 @@ def main():
             }
             
             business_id = db.create_business(st.session_state.user_id, business_data)
+            cached_get_user_businesses.clear()
             
-            # Store in session state
+            # Store only the id; pages hydrate the business from the database
             st.session_state.business_id = business_id
-            st.session_state.business_data = business_data
+            st.query_params["bid"] = business_id
             st.session_state.game_round = 1
             st.session_state.game_score = 0
             
@@ -180,27 +205,42 @@ def main():
     st.markdown("---")
     st.markdown("### 📊 Your Existing Businesses")
     
-    existing_businesses = db.get_user_businesses(st.session_state.user_id)
+    existing_businesses = cached_get_user_businesses(st.session_state.user_id)
     
     if existing_businesses:
-        for biz in existing_businesses:
-            with st.expander(f"{BUSINESS_TYPES.get(biz.get('business_type', 'Unknown'), {}).get('icon', '🏢')} {biz.get('business_type')} - {biz.get('location')}"):
-                col_a, col_b, col_c = st.columns(3)
-                
-                with col_a:
-                    st.metric("Capital", f"₹{biz.get('capital', 0):,}")
-                
-                with col_b:
-                    st.metric("Current Round", biz.get('current_round', 1))
-                
-                with col_c:
-                    st.metric("Status", biz.get('status', 'active').title())
-                
-                if st.button(f"Continue This Business", key=biz['business_id']):
-                    st.session_state.business_id = biz['business_id']
-                    st.session_state.business_data = biz
-                    st.session_state.game_round = biz.get('current_round', 1)
-                    st.success("Business loaded! Go to 'Game Scenarios' to continue.")
+        rows_html = "".join(
+            _ROW_TMPL.format(
+                label=escape(_BIZ_LABELS.get(biz.get('business_type'), f"🏢 {biz.get('business_type')}")),
+                location=escape(str(biz.get('location', ''))),
+                capital=biz.get('capital', 0),
+                current_round=biz.get('current_round', 1),
+                status=escape(biz.get('status', 'active').title())
+            )
+            for biz in existing_businesses
+        )
+        st.markdown(_TABLE_WRAPPER.format(rows=rows_html), unsafe_allow_html=True)
+        
+        businesses_by_id = {biz['business_id']: biz for biz in existing_businesses}
+        
+        col_sel, col_btn = st.columns([3, 1])
+        
+        with col_sel:
+            continue_id = st.selectbox(
+                "Select a business to continue",
+                options=tuple(businesses_by_id),
+                format_func=lambda bid: business_label(businesses_by_id[bid])
+            )
+        
+        with col_btn:
+            st.markdown("<br>", unsafe_allow_html=True)
+            continue_clicked = st.button("Continue This Business", use_container_width=True)
+        
+        if continue_clicked:
+            biz = businesses_by_id[continue_id]
+            st.session_state.business_id = biz['business_id']
+            st.query_params["bid"] = biz['business_id']
+            st.session_state.game_round = biz.get('current_round', 1)
+            st.success("Business loaded! Go to 'Game Scenarios' to continue.")
     else:
         st.info("No businesses created yet. Create your first business above!")
 
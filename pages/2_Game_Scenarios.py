@@ -6,111 +6,112 @@ import streamlit as st
 import sys
 from pathlib import Path
 import time
+import asyncio
+from bisect import bisect_right
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_ROOT = str(Path(__file__).resolve().parent.parent)
+# Pages rerun on every interaction, so only add the project root once
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
-from config import GAME_SETTINGS, SCORING_WEIGHTS, SCORE_THRESHOLDS
-from utils.database import DatabaseManager
-from utils.ai_manager import AIManager
+from config import get_config
+from utils.resources import get_db, get_ai, cached_get_business, cached_get_user_businesses
+from utils.style import inject_css
+
+CFG = get_config()
 
 st.set_page_config(page_title="Game Scenarios", page_icon="🎮", layout="wide")
 
 # Initialize
-db = DatabaseManager()
-ai = AIManager(provider="huggingface")  # Default to Hugging Face
+db = get_db()
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .scenario-box {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        padding: 2rem;
-        border-radius: 15px;
-        color: white;
-        font-size: 1.1rem;
-        margin: 1rem 0;
-    }
-    .option-button {
-        background: #ffffff;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        border: 2px solid #ddd;
-        cursor: pointer;
-    }
-    .option-button:hover {
-        border-color: #4CAF50;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-    }
-    .event-alert {
-        background: #ff9800;
-        padding: 1rem;
-        border-radius: 8px;
-        color: white;
-        margin: 1rem 0;
-    }
-    .score-card {
-        background: #4CAF50;
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
+inject_css("game_scenarios")
+
+# Score weights and feedback bands are fixed, so resolve them once at import
+_W_RISK = CFG.scoring_weights["risk"]
+_W_REWARD = CFG.scoring_weights["reward"]
+_W_REALISM = CFG.scoring_weights["realism"]
+
+_FEEDBACK = {
+    "excellent": ("🌟 Excellent Decision!", "#4CAF50"),
+    "good": ("👍 Good Choice!", "#2196F3"),
+    "average": ("🤔 Acceptable, but could be better", "#FF9800")
+}
+_BANDS = sorted((CFG.score_thresholds[level], feedback) for level, feedback in _FEEDBACK.items())
+_BAND_THRESHOLDS = [threshold for threshold, _ in _BANDS]
+_BAND_FEEDBACK = [("⚠️ Risky Decision - Review your strategy", "#F44336")] + [feedback for _, feedback in _BANDS]
+
+@st.cache_data(ttl=3600, max_entries=512, show_spinner="🤖 AI is creating your scenario...")
+def _gen_scenario(business_type: str, location: str, capital: int, employment_mode: str,
+                  round_number: int, resources_key: tuple, use_cache: bool = True) -> dict:
+    """Generate an English scenario, cached on the fields that shape the AI prompt
+    
+    Provider errors propagate, so st.cache_data never stores a fallback scenario.
+    Translation happens outside, in _localize_scenario, so a failed one is retried.
+    """
+    # Only reached from the generate buttons, so the AI manager is built on first use
+    ai = get_ai(provider="huggingface")  # Default to Hugging Face
+    business_data = {
+        "business_type": business_type,
+        "location": location,
+        "capital": capital,
+        "employment_mode": employment_mode,
+        "round": round_number,
+        "resources": dict(resources_key)
     }
-    </style>
-""", unsafe_allow_html=True)
+    
+    return asyncio.run(ai.agenerate_scenario(business_data, use_cache=use_cache, raise_errors=True))
+
+def _localize_scenario(scenario: dict, language: str) -> dict:
+    """Translate a scenario; translations are cached per string by the AI manager"""
+    if language == "English":
+        return scenario
+    
+    try:
+        return asyncio.run(get_ai(provider="huggingface").atranslate_scenario(scenario, language, raise_errors=True))
+    except Exception as e:
+        # A toast, because the rerun after generating would clear an inline warning
+        st.toast(f"Translation failed, showing English: {str(e)}", icon="⚠️")
+        return scenario
 
 def calculate_score(risk: int, reward: int, realism: int) -> int:
     """Calculate weighted score"""
-    weighted_score = (
-        risk * SCORING_WEIGHTS["risk"] +
-        reward * SCORING_WEIGHTS["reward"] +
-        realism * SCORING_WEIGHTS["realism"]
-    ) * 10
-    
-    return int(weighted_score)
+    return int((risk * _W_RISK + reward * _W_REWARD + realism * _W_REALISM) * 10)
 
 def get_feedback(score: int) -> tuple:
     """Get feedback message and color based on score"""
-    if score >= SCORE_THRESHOLDS["excellent"]:
-        return "🌟 Excellent Decision!", "#4CAF50"
-    elif score >= SCORE_THRESHOLDS["good"]:
-        return "👍 Good Choice!", "#2196F3"
-    elif score >= SCORE_THRESHOLDS["average"]:
-        return "🤔 Acceptable, but could be better", "#FF9800"
-    else:
-        return "⚠️ Risky Decision - Review your strategy", "#F44336"
+    return _BAND_FEEDBACK[bisect_right(_BAND_THRESHOLDS, score)]
 
-def main():
-    st.title("🎮 Business Scenarios")
-    
-    # Check if business is set up
-    if 'business_id' not in st.session_state or not st.session_state.business_id:
-        st.warning("⚠️ Please set up your business first!")
-        st.info("👉 Go to 'Business Setup' page to create your business.")
-        return
+def _normalize_scenario(scenario: dict) -> dict:
+    """Resolve score_logic into a list of (risk, reward, realism) indexed by option
     
-    # Load business data
-    business_data = db.get_business(st.session_state.business_id)
+    Returns a new dict; the input may be a shared fallback scenario.
+    """
+    score_logic = scenario.get('score_logic', {})
+    return {
+        **scenario,
+        'score_list': [
+            (metrics.get('risk', 5), metrics.get('reward', 5), metrics.get('realism', 5)) if metrics else None
+            for metrics in (score_logic.get(f"option_{i + 1}") for i in range(len(scenario.get('options', []))))
+        ]
+    }
+
+def select_option(opt_idx: int):
+    """Button callback; runs before the fragment rerun so no explicit st.rerun is needed"""
+    st.session_state.selected_option = opt_idx
+    st.session_state.scenario_completed = True
+
+@st.fragment
+def scenario_panel(business_id: str):
+    """Scenario, options and result block; reruns on its own when an option is clicked"""
+    business_data = cached_get_business(business_id)
     if not business_data:
-        st.error("Business not found! Please create a new business.")
         return
     
-    # Header with business info
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("Business", business_data.get('business_type', 'Unknown'))
-    
-    with col2:
-        st.metric("Round", business_data.get('current_round', 1))
-    
-    with col3:
-        st.metric("Total Score", business_data.get('total_score', 0))
-    
-    with col4:
-        st.metric("Capital", f"₹{business_data.get('capital', 0):,}")
-    
-    st.markdown("---")
+    business_type, current_round, current_total = (
+        business_data.get(k, d) for k, d in (('business_type', 'Unknown'), ('current_round', 1), ('total_score', 0))
+    )
     
     # Initialize scenario in session state
     if 'current_scenario' not in st.session_state:
@@ -122,17 +123,50 @@ def main():
     
     # Generate new scenario button
     if st.session_state.current_scenario is None or st.session_state.scenario_completed:
-        if st.button("🎲 Generate New Scenario", use_container_width=True, type="primary"):
-            with st.spinner("🤖 AI is creating your scenario..."):
-                scenario = ai.generate_scenario(business_data)
-                st.session_state.current_scenario = scenario
-                st.session_state.scenario_completed = False
-                st.session_state.selected_option = None
-                st.rerun()
+        col_gen, col_force = st.columns([3, 1])
+        
+        with col_gen:
+            generate = st.button("🎲 Generate New Scenario", use_container_width=True, type="primary")
+        
+        with col_force:
+            force_new = st.button("♻️ Force New Scenario", use_container_width=True)
+        
+        if generate or force_new:
+            if force_new:
+                _gen_scenario.clear()
+            
+            resources = business_data.get('resources', {})
+            resources_key = tuple(sorted(
+                (k, tuple(v) if isinstance(v, list) else v) for k, v in resources.items()
+            ))
+            
+            try:
+                scenario = _gen_scenario(
+                    business_data.get('business_type', 'General Business'),
+                    business_data.get('location', 'Rural Area'),
+                    business_data.get('capital', 50000),
+                    business_data.get('employment_mode', 'Self-operated'),
+                    current_round,
+                    resources_key,
+                    use_cache=not force_new
+                )
+            except Exception as e:
+                # Served for this click only; the next generate retries the provider.
+                # A toast, because the rerun below would clear an inline error
+                st.toast(f"AI API Error: {str(e)}", icon="⚠️")
+                scenario = get_ai(provider="huggingface").get_fallback_scenario(business_data)
+            scenario = _localize_scenario(scenario, business_data.get('language', 'English'))
+            st.session_state.current_scenario = _normalize_scenario(scenario)
+            st.session_state.scenario_completed = False
+            st.session_state.selected_option = None
+            st.rerun()
     
     # Display scenario
     if st.session_state.current_scenario:
         scenario = st.session_state.current_scenario
+        event, options, consequences, score_list = (
+            scenario.get(k, d) for k, d in (('event', None), ('options', []), ('consequences', []), ('score_list', []))
+        )
         
         # Scenario description
         st.markdown(f"""
@@ -143,12 +177,12 @@ def main():
         """, unsafe_allow_html=True)
         
         # Dynamic event (if any)
-        if scenario.get('event') and scenario['event'].get('description'):
+        if event and event.get('description'):
             st.markdown(f"""
             <div class="event-alert">
                 <h3>⚡ Dynamic Event!</h3>
-                <p><strong>{scenario['event']['description']}</strong></p>
-                <p><em>Impact: {scenario['event'].get('impact', 'Unknown impact')}</em></p>
+                <p><strong>{event['description']}</strong></p>
+                <p><em>Impact: {event.get('impact', 'Unknown impact')}</em></p>
             </div>
             """, unsafe_allow_html=True)
         
@@ -156,17 +190,14 @@ def main():
         if not st.session_state.scenario_completed:
             st.markdown("### 🤔 What will you do?")
             
-            options = scenario.get('options', [])
-            
             for idx, option in enumerate(options, 1):
-                if st.button(
+                st.button(
                     f"Option {idx}: {option}",
                     key=f"opt_{idx}",
-                    use_container_width=True
-                ):
-                    st.session_state.selected_option = idx - 1
-                    st.session_state.scenario_completed = True
-                    st.rerun()
+                    use_container_width=True,
+                    on_click=select_option,
+                    args=(idx - 1,)
+                )
         
         # Show result
         if st.session_state.scenario_completed and st.session_state.selected_option is not None:
@@ -176,19 +207,12 @@ def main():
             st.markdown("### 📊 Decision Result")
             
             # Get consequence
-            consequences = scenario.get('consequences', [])
             if opt_idx < len(consequences):
                 st.info(f"**Outcome:** {consequences[opt_idx]}")
             
             # Get score logic
-            score_logic = scenario.get('score_logic', {})
-            option_key = f"option_{opt_idx + 1}"
-            
-            if option_key in score_logic:
-                metrics = score_logic[option_key]
-                risk = metrics.get('risk', 5)
-                reward = metrics.get('reward', 5)
-                realism = metrics.get('realism', 5)
+            if opt_idx < len(score_list) and score_list[opt_idx]:
+                risk, reward, realism = score_list[opt_idx]
                 
                 # Calculate score
                 total_score = calculate_score(risk, reward, realism)
@@ -217,10 +241,6 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                # Update database
-                current_round = business_data.get('current_round', 1)
-                current_total = business_data.get('total_score', 0)
-                
                 # Save scenario result
                 scenario_data = {
                     "round": current_round,
@@ -230,23 +250,26 @@ def main():
                     "reward": reward,
                     "realism": realism
                 }
-                db.save_scenario(st.session_state.business_id, scenario_data)
-                
-                # Update business
-                db.update_business(st.session_state.business_id, {
-                    "current_round": current_round + 1,
-                    "total_score": current_total + total_score
-                })
                 
-                # Update user
-                db.update_user_score(st.session_state.user_id, total_score)
+                # Save the result, business and user score in one WAL write; the leaderboard entry is merged by the flush thread
+                with db.batch():
+                    db.save_scenario(business_id, scenario_data)
+                    
+                    db.update_business(business_id, {
+                        "current_round": current_round + 1,
+                        "total_score": current_total + total_score
+                    })
+                    
+                    db.update_user_score(st.session_state.user_id, total_score)
+                    
+                    db.update_leaderboard(
+                        st.session_state.user_id,
+                        total_score,
+                        business_type
+                    )
                 
-                # Update leaderboard
-                db.update_leaderboard(
-                    st.session_state.user_id,
-                    total_score,
-                    business_data.get('business_type', 'Unknown')
-                )
+                cached_get_business.clear()
+                cached_get_user_businesses.clear()
                 
                 # Advice
                 st.markdown("### 💡 Business Insight")
@@ -260,11 +283,11 @@ def main():
                     st.warning("🤔 This decision might not be very realistic in rural contexts. Always consider local conditions and resources.")
                 
                 # Progress check
-                if current_round >= GAME_SETTINGS["max_rounds"]:
+                if current_round >= CFG.game_settings["max_rounds"]:
                     st.success("🎉 Congratulations! You've completed the game!")
                     st.balloons()
                     
-                    analytics = db.get_business_analytics(st.session_state.business_id)
+                    analytics = db.get_business_analytics(business_id)
                     
                     st.markdown("### 📈 Final Report")
                     col_x, col_y, col_z = st.columns(3)
@@ -281,10 +304,67 @@ def main():
                     if st.button("🔄 Start New Game"):
                         st.session_state.current_scenario = None
                         st.session_state.scenario_completed = False
-                        db.update_business(st.session_state.business_id, {
+                        db.update_business(business_id, {
                             "status": "completed"
                         })
+                        cached_get_business.clear()
+                        cached_get_user_businesses.clear()
                         st.info("Create a new business from the Business Setup page!")
 
+def main():
+    st.title("🎮 Business Scenarios")
+    
+    # Check if user is logged in; a shared ?bid= link opens a fresh session without one
+    if 'user_id' not in st.session_state:
+        st.warning("⚠️ Please log in from the home page first!")
+        return
+    
+    # The selected business comes from the URL (?bid=...) when the logged-in user owns it,
+    # otherwise from this session's choice
+    business_id = st.session_state.get('business_id')
+    linked_id = st.query_params.get("bid")
+    if linked_id and linked_id != business_id:
+        linked = cached_get_business(linked_id)
+        if linked and linked.get("user_id") == st.session_state.user_id:
+            business_id = linked_id
+    
+    # Check if business is set up
+    if not business_id:
+        st.warning("⚠️ Please set up your business first!")
+        st.info("👉 Go to 'Business Setup' page to create your business.")
+        return
+    
+    st.session_state.business_id = business_id
+    st.query_params["bid"] = business_id
+    
+    # Load business data
+    business_data = cached_get_business(business_id)
+    if not business_data:
+        st.error("Business not found! Please create a new business.")
+        return
+    
+    business_type, current_round, total_score, capital = (
+        business_data.get(k, d) for k, d in (('business_type', 'Unknown'), ('current_round', 1), ('total_score', 0), ('capital', 0))
+    )
+    
+    # Header with business info
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Business", business_type)
+    
+    with col2:
+        st.metric("Round", current_round)
+    
+    with col3:
+        st.metric("Total Score", total_score)
+    
+    with col4:
+        st.metric("Capital", f"₹{capital:,}")
+    
+    st.markdown("---")
+    
+    scenario_panel(business_id)
+
 if __name__ == "__main__":
     main()
@@ -6,108 +6,166 @@ import streamlit as st
 import sys
 from pathlib import Path
 import time
-from datetime import datetime, timedelta
+import random
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_ROOT = str(Path(__file__).resolve().parent.parent)
+# Pages rerun on every interaction, so only add the project root once
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 from config import AUCTION_SETTINGS
-from utils.database import DatabaseManager
+from utils.resources import get_db, cached_get_business, cached_get_user_businesses, cached_get_active_auctions
+from utils.style import inject_css
 
 st.set_page_config(page_title="Auction Market", page_icon="🔨", layout="wide")
 
 # Initialize
-db = DatabaseManager()
+db = get_db()
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .auction-card {
-        background: #ffffff;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border: 2px solid #e0e0e0;
-        margin: 1rem 0;
-    }
-    .auction-card:hover {
-        border-color: #4CAF50;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    }
-    .live-badge {
-        background: #4CAF50;
-        color: white;
-        padding: 0.3rem 0.8rem;
-        border-radius: 20px;
-        font-size: 0.9rem;
-        font-weight: bold;
-    }
-    .closed-badge {
-        background: #9e9e9e;
-        color: white;
-        padding: 0.3rem 0.8rem;
-        border-radius: 20px;
-        font-size: 0.9rem;
-    }
-    .bid-btn {
-        background: #2196F3;
-        color: white;
-        padding: 0.5rem 1.5rem;
-        border-radius: 5px;
-        border: none;
-        font-size: 1rem;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_css("auction_market")
 
-# Auction items database
+# Item categories, sample categories and listing durations (seconds) are fixed;
+# an auction's ends_at is stored as a Unix timestamp
+CATEGORIES = tuple(AUCTION_SETTINGS["types"])
+SAMPLE_CATEGORIES = ("livestock", "equipment", "inventory")
+AUCTION_DURATIONS = {
+    "1 minute": 60,
+    "5 minutes": 300,
+    "10 minutes": 600,
+    "30 minutes": 1800
+}
+DURATION_OPTIONS = tuple(AUCTION_DURATIONS)
+
+# Auction items database (read-only, so tuples)
 AUCTION_ITEMS = {
-    "livestock": [
+    "livestock": (
         {"name": "Dairy Cow", "base_price": 35000, "description": "Healthy milking cow, 3 years old"},
         {"name": "Goat", "base_price": 8000, "description": "Breeding goat, 2 years old"},
         {"name": "Chickens (10)", "base_price": 2000, "description": "Layer chickens, 6 months old"},
         {"name": "Buffalo", "base_price": 50000, "description": "Strong buffalo for milk and farming"}
-    ],
-    "equipment": [
+    ),
+    "equipment": (
         {"name": "Tractor (Used)", "base_price": 150000, "description": "Working condition, 5 years old"},
         {"name": "Irrigation Pump", "base_price": 12000, "description": "Electric pump, 2HP"},
         {"name": "Milking Machine", "base_price": 25000, "description": "Automatic milking machine"},
         {"name": "Solar Panel Set", "base_price": 45000, "description": "500W solar panel with inverter"}
-    ],
-    "land": [
+    ),
+    "land": (
         {"name": "1 Acre Farmland", "base_price": 200000, "description": "Fertile land with water access"},
         {"name": "0.5 Acre Plot", "base_price": 100000, "description": "Near village center"},
         {"name": "2 Acre Field", "base_price": 350000, "description": "Suitable for crops"}
-    ],
-    "inventory": [
+    ),
+    "inventory": (
         {"name": "50kg Seeds", "base_price": 5000, "description": "Wheat/Rice seeds, quality assured"},
         {"name": "Fertilizer (100kg)", "base_price": 3000, "description": "Organic fertilizer"},
         {"name": "Animal Feed (500kg)", "base_price": 8000, "description": "Nutritious cattle feed"},
         {"name": "Fishing Nets (5)", "base_price": 6000, "description": "Professional fishing nets"}
-    ]
+    )
+}
+
+# Sample auctions are drawn from fixed items, so price them once at import
+SAMPLE_AUCTION_COUNT = 3
+_SAMPLE_AUCTIONS = {
+    category: tuple(
+        {
+            "item_name": item["name"],
+            "description": item["description"],
+            "category": category,
+            "starting_price": int(item["base_price"] * AUCTION_SETTINGS["starting_price_factor"]),
+            "current_bid": int(item["base_price"] * AUCTION_SETTINGS["starting_price_factor"]),
+            "market_value": item["base_price"],
+            "highest_bidder": None
+        }
+        for item in AUCTION_ITEMS[category]
+    )
+    for category in SAMPLE_CATEGORIES
 }
 
 def create_sample_auctions():
-    """Create sample auctions if none exist"""
-    active_auctions = db.get_active_auctions()
+    """Top up the market to SAMPLE_AUCTION_COUNT active auctions"""
+    needed = SAMPLE_AUCTION_COUNT - len(cached_get_active_auctions())
+    if needed <= 0:
+        return
+    
+    ends_at = time.time() + AUCTION_SETTINGS["auction_duration"]
+    db.create_auctions_bulk([
+        {**random.choice(_SAMPLE_AUCTIONS[category]), "ends_at": ends_at}
+        for category in random.sample(SAMPLE_CATEGORIES, needed)
+    ])
+    cached_get_active_auctions.clear()
+
+@st.fragment
+def render_auction_card(auction: dict, available_capital: int):
+    """One auction card with its bid form; reruns on its own when the form is used"""
+    auction_id = auction['auction_id']
     
-    if len(active_auctions) < 3:
-        import random
+    with st.container():
+        st.markdown('<div class="auction-card">', unsafe_allow_html=True)
         
-        for category in ["livestock", "equipment", "inventory"]:
-            items = AUCTION_ITEMS[category]
-            item = random.choice(items)
-            
-            auction_data = {
-                "item_name": item["name"],
-                "description": item["description"],
-                "category": category,
-                "starting_price": int(item["base_price"] * AUCTION_SETTINGS["starting_price_factor"]),
-                "current_bid": int(item["base_price"] * AUCTION_SETTINGS["starting_price_factor"]),
-                "market_value": item["base_price"],
-                "highest_bidder": None,
-                "ends_at": (datetime.now() + timedelta(seconds=AUCTION_SETTINGS["auction_duration"])).isoformat()
-            }
+        col_a, col_b, col_c = st.columns([2, 1, 1])
+        
+        with col_a:
+            st.markdown(f"### {auction['item_name']}")
+            st.markdown(f"**Category:** {auction['category'].title()}")
+            st.markdown(f"📝 {auction['description']}")
+            st.markdown(f"💎 Market Value: ₹{auction['market_value']:,}")
+        
+        with col_b:
+            st.markdown('<span class="live-badge">🔴 LIVE</span>', unsafe_allow_html=True)
+            st.markdown(f"**Starting Price**")
+            st.markdown(f"₹{auction['starting_price']:,}")
+            st.markdown(f"**Current Bid**")
+            st.markdown(f"₹{auction['current_bid']:,}")
+        
+        with col_c:
+            # Bid form
+            min_bid = auction['current_bid'] + AUCTION_SETTINGS['min_bid_increment']
             
-            db.create_auction(auction_data)
+            if min_bid > available_capital:
+                st.info(f"Minimum bid is ₹{min_bid:,}, more than your balance")
+            else:
+                with st.form(f"bid_form_{auction_id}"):
+                    bid_amount = st.number_input(
+                        "Your Bid (₹)",
+                        min_value=min_bid,
+                        max_value=available_capital,
+                        value=min_bid,
+                        step=AUCTION_SETTINGS['min_bid_increment'],
+                        key=f"bid_{auction_id}"
+                    )
+                    
+                    submit_bid = st.form_submit_button("Place Bid 🔨", use_container_width=True)
+                    
+                    if submit_bid:
+                        if bid_amount > available_capital:
+                            st.error("Insufficient capital!")
+                        elif bid_amount < min_bid:
+                            st.error(f"Minimum bid is ₹{min_bid:,}")
+                        else:
+                            # Place the bid and deduct it from capital together; the database
+                            # re-checks the live bid and balance, since ours may be cached
+                            placed = db.submit_bid(
+                                auction_id,
+                                st.session_state.user_id,
+                                st.session_state.business_id,
+                                bid_amount,
+                                min_increment=AUCTION_SETTINGS['min_bid_increment']
+                            )
+                            cached_get_business.clear()
+                            cached_get_user_businesses.clear()
+                            cached_get_active_auctions.clear()
+                            
+                            # The toast survives the rerun; a full rerun (not just this fragment)
+                            # is needed so the balance, bids and bidding history are refreshed
+                            if placed:
+                                st.toast(f"✅ Bid placed: ₹{bid_amount:,}", icon="🔨")
+                            else:
+                                st.toast("❌ Bid not placed: you were outbid or your balance changed", icon="⚠️")
+                            st.rerun()
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown("<br>", unsafe_allow_html=True)
 
 def main():
     st.title("🔨 Auction Market")
@@ -136,11 +194,15 @@ def main():
     
     with col2:
         if st.button("🔄 Refresh Auctions", use_container_width=True):
+            cached_get_active_auctions.clear()
             st.rerun()
     
     # Create sample auctions
     create_sample_auctions()
     
+    # One cached fetch serves both the live auctions and the bidding history tabs
+    active_auctions = cached_get_active_auctions()
+    
     st.markdown("---")
     
     # Tabs for different sections
@@ -149,83 +211,22 @@ def main():
     with tab1:
         st.markdown("### 🔴 Active Auctions")
         
-        active_auctions = db.get_active_auctions()
-        
         if not active_auctions:
             st.info("No active auctions at the moment. Check back later!")
         else:
             for auction in active_auctions:
-                auction_id = auction['auction_id']
-                
-                with st.container():
-                    st.markdown('<div class="auction-card">', unsafe_allow_html=True)
-                    
-                    col_a, col_b, col_c = st.columns([2, 1, 1])
-                    
-                    with col_a:
-                        st.markdown(f"### {auction['item_name']}")
-                        st.markdown(f"**Category:** {auction['category'].title()}")
-                        st.markdown(f"📝 {auction['description']}")
-                        st.markdown(f"💎 Market Value: ₹{auction['market_value']:,}")
-                    
-                    with col_b:
-                        st.markdown('<span class="live-badge">🔴 LIVE</span>', unsafe_allow_html=True)
-                        st.markdown(f"**Starting Price**")
-                        st.markdown(f"₹{auction['starting_price']:,}")
-                        st.markdown(f"**Current Bid**")
-                        st.markdown(f"₹{auction['current_bid']:,}")
-                    
-                    with col_c:
-                        # Bid form
-                        with st.form(f"bid_form_{auction_id}"):
-                            min_bid = auction['current_bid'] + AUCTION_SETTINGS['min_bid_increment']
-                            
-                            bid_amount = st.number_input(
-                                "Your Bid (₹)",
-                                min_value=min_bid,
-                                max_value=available_capital,
-                                value=min_bid,
-                                step=AUCTION_SETTINGS['min_bid_increment'],
-                                key=f"bid_{auction_id}"
-                            )
-                            
-                            submit_bid = st.form_submit_button("Place Bid 🔨", use_container_width=True)
-                            
-                            if submit_bid:
-                                if bid_amount > available_capital:
-                                    st.error("Insufficient capital!")
-                                elif bid_amount < min_bid:
-                                    st.error(f"Minimum bid is ₹{min_bid:,}")
-                                else:
-                                    # Place bid
-                                    db.place_bid(auction_id, st.session_state.user_id, bid_amount)
-                                    
-                                    # Update capital
-                                    db.update_business(st.session_state.business_id, {
-                                        "capital": available_capital - bid_amount
-                                    })
-                                    
-                                    st.success(f"✅ Bid placed: ₹{bid_amount:,}")
-                                    time.sleep(1)
-                                    st.rerun()
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
-                    st.markdown("<br>", unsafe_allow_html=True)
+                render_auction_card(auction, available_capital)
     
     with tab2:
         st.markdown("### ✅ Your Bidding History")
         
-        # Get all auctions and filter user's bids
-        all_auctions = db.get_active_auctions()
-        user_bids = []
-        
-        for auction in all_auctions:
-            for bid in auction.get('bids', []):
-                if bid['user_id'] == st.session_state.user_id:
-                    user_bids.append({
-                        'auction': auction,
-                        'bid': bid
-                    })
+        # Look up the user's bids directly and pair them with the active auctions fetched above
+        auctions_by_id = {auction['auction_id']: auction for auction in active_auctions}
+        user_bids = [
+            {'auction': auctions_by_id[bid['auction_id']], 'bid': bid}
+            for bid in db.get_user_bids(st.session_state.user_id)
+            if bid['auction_id'] in auctions_by_id
+        ]
         
         if not user_bids:
             st.info("You haven't placed any bids yet!")
@@ -261,7 +262,7 @@ def main():
             with col_p:
                 item_category = st.selectbox(
                     "Item Category",
-                    ["livestock", "equipment", "land", "inventory"]
+                    CATEGORIES
                 )
                 
                 item_name = st.text_input("Item Name", placeholder="e.g., Dairy Cow")
@@ -291,7 +292,7 @@ def main():
                 
                 duration = st.selectbox(
                     "Auction Duration",
-                    ["1 minute", "5 minutes", "10 minutes", "30 minutes"],
+                    DURATION_OPTIONS,
                     index=1
                 )
             
@@ -301,14 +302,6 @@ def main():
                 if not item_name or not description:
                     st.error("Please fill all fields!")
                 else:
-                    # Parse duration
-                    duration_map = {
-                        "1 minute": 60,
-                        "5 minutes": 300,
-                        "10 minutes": 600,
-                        "30 minutes": 1800
-                    }
-                    
                     auction_data = {
                         "item_name": item_name,
                         "description": description,
@@ -318,14 +311,13 @@ def main():
                         "market_value": market_value,
                         "seller_id": st.session_state.user_id,
                         "highest_bidder": None,
-                        "ends_at": (datetime.now() + timedelta(seconds=duration_map[duration])).isoformat()
+                        "ends_at": time.time() + AUCTION_DURATIONS[duration]
                     }
                     
                     auction_id = db.create_auction(auction_data)
+                    cached_get_active_auctions.clear()
                     
-                    st.success(f"✅ Auction created successfully!")
-                    st.balloons()
-                    time.sleep(1)
+                    st.toast("✅ Auction created successfully!", icon="🚀")
                     st.rerun()
         
         st.markdown("---")
@@ -4,67 +4,74 @@ Admin Dashboard - Control panel for managing game data, scenarios, and settings
 
 import streamlit as st
 import sys
+import os
+import asyncio
+import hmac
+import heapq
+import hashlib
+from collections import Counter
 from pathlib import Path
-import json
 from datetime import datetime
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_ROOT = str(Path(__file__).resolve().parent.parent)
+# Pages rerun on every interaction, so only add the project root once
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 from config import BUSINESS_TYPES, DYNAMIC_EVENTS, AI_PROVIDERS
-from utils.database import DatabaseManager
+from utils.resources import get_db, get_ai, cached_get_market_prices
+from utils.style import inject_css
 
 st.set_page_config(page_title="Admin Dashboard", page_icon="⚙️", layout="wide")
 
 # Initialize
-db = DatabaseManager()
+db = get_db()
 
 # Admin password (in production, use proper authentication)
-ADMIN_PASSWORD = "admin123"
+# Only the digest is kept; override the default with the ADMIN_PASSWORD environment variable
+ADMIN_PASSWORD_HASH = hashlib.sha256(os.getenv("ADMIN_PASSWORD", "admin123").encode("utf-8")).digest()
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .admin-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .stat-card {
-        background: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 4px solid #4CAF50;
-    }
-    .data-table {
-        background: white;
-        padding: 1rem;
-        border-radius: 8px;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_css("admin_dashboard")
+
+# Derived admin views are keyed on the database version, so they are rebuilt only after a change
+@st.cache_data(max_entries=4, show_spinner=False)
+def overview_data(version: int) -> dict:
+    """Overview statistics and the ten most recent users"""
+    data = db._read_data()
+    recent_users = heapq.nlargest(
+        10,
+        data.get('users', {}).items(),
+        key=lambda x: x[1].get('created_at', '')
+    )
+    return {"stats": db.get_statistics(), "recent_users": recent_users}
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def business_type_counts(version: int) -> dict:
+    """Number of businesses per business type"""
+    businesses = db._read_data().get('businesses', {})
+    return dict(Counter(biz.get('business_type', 'Unknown') for biz in businesses.values()))
 
 def check_admin_access():
     """Check if user has admin access"""
-    if 'admin_authenticated' not in st.session_state:
-        st.session_state.admin_authenticated = False
+    # Authenticated sessions skip the login form and the password check entirely
+    if st.session_state.get('admin_authenticated'):
+        return
     
-    if not st.session_state.admin_authenticated:
-        st.markdown('<div class="admin-header"><h1>🔐 Admin Access Required</h1></div>', unsafe_allow_html=True)
-        
-        password = st.text_input("Enter Admin Password", type="password")
-        
-        if st.button("Login"):
-            if password == ADMIN_PASSWORD:
-                st.session_state.admin_authenticated = True
-                st.success("✅ Access granted!")
-                st.rerun()
-            else:
-                st.error("❌ Invalid password!")
-        
-        st.stop()
+    st.session_state.admin_authenticated = False
+    st.markdown('<div class="admin-header"><h1>🔐 Admin Access Required</h1></div>', unsafe_allow_html=True)
+    
+    password = st.text_input("Enter Admin Password", type="password")
+    
+    if st.button("Login"):
+        if hmac.compare_digest(hashlib.sha256(password.encode("utf-8")).digest(), ADMIN_PASSWORD_HASH):
+            st.session_state.admin_authenticated = True
+            st.success("✅ Access granted!")
+            st.rerun()
+        else:
+            st.error("❌ Invalid password!")
+    
+    st.stop()
 
 def main():
     check_admin_access()
@@ -105,7 +112,8 @@ def show_overview():
     """Display overview statistics"""
     st.markdown("### 📊 System Overview")
     
-    stats = db.get_statistics()
+    overview = overview_data(db.version)
+    stats = overview["stats"]
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -135,12 +143,7 @@ def show_overview():
     st.markdown("### 📝 Recent Activity")
     
     # Get recent users
-    data = db._read_data()
-    recent_users = sorted(
-        data.get('users', {}).items(),
-        key=lambda x: x[1].get('created_at', ''),
-        reverse=True
-    )[:10]
+    recent_users = overview["recent_users"]
     
     if recent_users:
         st.markdown('<div class="data-table">', unsafe_allow_html=True)
@@ -166,13 +169,9 @@ def show_overview():
     
     with col_x:
         if st.button("📥 Export Database", use_container_width=True):
-            data = db._read_data()
-            
-            json_str = json.dumps(data, indent=2, ensure_ascii=False)
-            
             st.download_button(
                 label="Download JSON",
-                data=json_str,
+                data=db.export_json(),
                 file_name=f"game_data_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
@@ -182,8 +181,9 @@ def show_overview():
         
         if uploaded_file and st.button("Import"):
             try:
-                imported_data = json.load(uploaded_file)
-                db._write_data(imported_data)
+                db.import_json(uploaded_file.getvalue())
+                # Every cached read is stale once the whole database is replaced
+                st.cache_data.clear()
                 st.success("✅ Database imported successfully!")
             except Exception as e:
                 st.error(f"❌ Import failed: {str(e)}")
@@ -195,21 +195,19 @@ def show_scenario_manager():
     tab1, tab2 = st.tabs(["View Scenarios", "Add Scenario"])
     
     with tab1:
-        # Get all scenarios
-        data = db._read_data()
-        scenarios = data.get('scenarios', {})
+        # Only the listed scenarios are copied out of the database
+        scenarios = db.get_scenarios(limit=20)
         
-        st.markdown(f"**Total Scenarios:** {len(scenarios)}")
+        st.markdown(f"**Total Scenarios:** {db.get_statistics()['total_scenarios']}")
         
         if scenarios:
-            for scenario_id, scenario in list(scenarios.items())[:20]:
+            for scenario in scenarios:
+                scenario_id = scenario.pop('scenario_id')
                 with st.expander(f"Scenario {scenario_id}"):
                     st.json(scenario)
                     
                     if st.button(f"Delete", key=f"del_{scenario_id}"):
-                        del scenarios[scenario_id]
-                        data['scenarios'] = scenarios
-                        db._write_data(data)
+                        db.delete_scenario(scenario_id)
                         st.success("Deleted!")
                         st.rerun()
     
@@ -272,7 +270,7 @@ def show_market_prices():
     """Manage market prices"""
     st.markdown("### 💰 Market Price Manager")
     
-    current_prices = db.get_market_prices()
+    current_prices = cached_get_market_prices()
     
     st.markdown("#### Update Market Prices")
     
@@ -302,6 +300,7 @@ def show_market_prices():
             }
             
             db.update_market_prices(prices)
+            cached_get_market_prices.clear()
             st.success("✅ Prices updated!")
             st.rerun()
     
@@ -378,10 +377,8 @@ def show_ai_settings():
     st.markdown("#### Test AI Connection")
     
     if st.button("Test Connection"):
-        from utils.ai_manager import AIManager
-        
         try:
-            ai = AIManager(provider=provider)
+            ai = get_ai(provider=provider)
             test_data = {
                 'business_type': 'Dairy Farming',
                 'location': 'Test Village',
@@ -391,8 +388,11 @@ def show_ai_settings():
                 'round': 1
             }
             
-            with st.spinner("Testing AI connection..."):
-                result = ai.generate_scenario(test_data)
+            # The request runs in a worker thread while the status box shows progress
+            with st.status("Testing AI connection...") as status:
+                # Bypass the scenario cache so every test reaches the provider
+                result = asyncio.run(ai.agenerate_scenario(test_data, use_cache=False))
+                status.update(label="AI connection test finished", state="complete")
             
             if result:
                 st.success("✅ AI connection successful!")
@@ -408,17 +408,10 @@ def show_analytics():
     """Show detailed analytics"""
     st.markdown("### 📈 Analytics Dashboard")
     
-    data = db._read_data()
-    
     # Business type distribution
     st.markdown("#### Business Type Distribution")
     
-    businesses = data.get('businesses', {})
-    business_types = {}
-    
-    for biz in businesses.values():
-        biz_type = biz.get('business_type', 'Unknown')
-        business_types[biz_type] = business_types.get(biz_type, 0) + 1
+    business_types = business_type_counts(db.version)
     
     if business_types:
         col1, col2 = st.columns(2)
@@ -439,27 +432,21 @@ def show_analytics():
     leaderboard = db.get_leaderboard(20)
     
     if leaderboard:
-        for idx, entry in enumerate(leaderboard, 1):
-            col_a, col_b, col_c, col_d = st.columns([1, 3, 2, 2])
-            
-            with col_a:
-                if idx == 1:
-                    st.markdown("🥇")
-                elif idx == 2:
-                    st.markdown("🥈")
-                elif idx == 3:
-                    st.markdown("🥉")
-                else:
-                    st.write(f"{idx}.")
-            
-            with col_b:
-                st.write(entry['user_name'])
-            
-            with col_c:
-                st.write(entry['business_type'])
-            
-            with col_d:
-                st.write(f"Score: {entry['score']}")
+        # One table element instead of a row of columns per entry
+        medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+        st.dataframe(
+            [
+                {
+                    "Rank": medals.get(idx, f"{idx}."),
+                    "Player": entry['user_name'],
+                    "Business": entry['business_type'],
+                    "Score": entry['score']
+                }
+                for idx, entry in enumerate(leaderboard, 1)
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
 
 if __name__ == "__main__":
     main()
@@ -44,7 +44,7 @@ echo ""
 # Install dependencies
 echo "📦 Installing dependencies..."
 pip install --upgrade pip
-pip install streamlit>=1.28.0 requests>=2.31.0 python-dotenv>=1.0.0
+pip install streamlit>=1.37.0 requests>=2.31.0 python-dotenv>=1.0.0 orjson>=3.8.0
 
 echo "✅ Dependencies installed"
 echo ""
@@ -2,7 +2,15 @@
 Utils package for Rural Business Simulator
 """
 
-from .ai_manager import AIManager
-from .database import DatabaseManager
-
 __all__ = ['AIManager', 'DatabaseManager']
+
+
+def __getattr__(name):
+    """Import the managers on first access, so pages only pay for what they use"""
+    if name == 'AIManager':
+        from .ai_manager import AIManager
+        return AIManager
+    if name == 'DatabaseManager':
+        from .database import DatabaseManager
+        return DatabaseManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,62 +3,360 @@ AI Manager for handling API calls to different AI providers
 """
 
 import os
+import re
+import copy
 import json
+import math
+import time
+import asyncio
+import hashlib
+import threading
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import Counter, OrderedDict, deque
+from functools import lru_cache
+from typing import Dict, Final, List, Any, Optional, Tuple
 import streamlit as st
-from config import AI_PROVIDERS, SCENARIO_PROMPT_TEMPLATE, TRANSLATION_PROMPT_TEMPLATE
+from config import (
+    AI_PROVIDERS,
+    BATCH_TRANSLATION_PROMPT_TEMPLATE,
+    SCENARIO_SYSTEM_PREAMBLE,
+    TRANSLATION_PROMPT_TEMPLATE,
+    render_scenario_prompt
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize to a JSON string, using orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=str, option=option).decode('utf-8')
+    return json.dumps(obj, sort_keys=sort_keys, default=str)
+
+
+def _loads(text: str) -> Any:
+    """Parse a JSON string, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+@lru_cache(maxsize=8)
+def _load_api_key(env_key: str) -> Optional[str]:
+    """Retrieve API key from environment or Streamlit secrets, once per key name"""
+    # Try Streamlit secrets first
+    try:
+        if hasattr(st, 'secrets') and env_key in st.secrets:
+            return st.secrets[env_key]
+    except:
+        pass
+    
+    # Fall back to environment variable
+    return os.getenv(env_key)
+
+
+# Patterns for pulling the JSON payload out of a model response
+_FENCE_RE = re.compile(r'^```(?:json)?\s*\n?([\s\S]*?)\n?```\s*$', re.MULTILINE)
+_OBJ_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+def _find_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} span in text, skipping braces inside string literals"""
+    start = text.find('{')
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if not depth:
+                return text[start:i + 1]
+    return None
+
+
+# "3) text" lines in a batch translation response
+_NUMBERED_LINE_RE = re.compile(r'^\s*(\d+)[).:]\s*(.*?)\s*$', re.MULTILINE)
+
+# Hardcoded scenarios used when no provider is configured or a call fails
+FALLBACK_SCENARIOS: Final[Dict[str, Dict[str, Any]]] = {
+    "Dairy Farming": {
+        "scenario": "Your dairy farm has been producing 40 liters of milk daily. A nearby cooperative offers to buy your entire production at ₹35/liter, but a new ice cream factory is willing to pay ₹45/liter if you can increase production to 60 liters daily. Your current setup needs investment to scale.",
+        "options": [
+            "Accept the cooperative's stable offer and continue current production",
+            "Invest ₹30,000 in 2 more cows and equipment to meet factory demand",
+            "Split production: 40L to cooperative, invest slowly to scale for factory later"
+        ],
+        "consequences": [
+            "Steady income of ₹42,000/month but limited growth potential. Low risk, moderate reward.",
+            "Potential ₹81,000/month if successful, but ₹30,000 upfront risk and 2-month ramp-up time.",
+            "Balanced approach: ₹42,000/month now, gradual scaling. Medium risk, growing reward."
+        ],
+        "score_logic": {
+            "option_1": {"risk": 2, "reward": 5, "realism": 9},
+            "option_2": {"risk": 8, "reward": 9, "realism": 7},
+            "option_3": {"risk": 4, "reward": 7, "realism": 8}
+        },
+        "event": {
+            "description": "Monsoon forecast shows heavy rains next month which could affect fodder supply",
+            "impact": "May need to purchase additional fodder at 30% higher cost"
+        }
+    },
+    "Solar Leasing": {
+        "scenario": "You've installed 10 solar panels and are leasing to 5 households at ₹1,200/month each. A village school wants to lease 10 more panels, but you'll need ₹150,000 for expansion. A government subsidy covers 40% if you apply within 30 days.",
+        "options": [
+            "Take a bank loan for full ₹150,000 at 12% interest",
+            "Apply for government subsidy, save ₹90,000, then expand",
+            "Partner with another solar entrepreneur to share costs and profits"
+        ],
+        "consequences": [
+            "Immediate expansion, ₹12,000/month revenue, but ₹18,000 interest annually. High debt risk.",
+            "Wait 45 days for subsidy approval, only ₹90,000 loan needed, ₹10,800/year interest. Delayed but safer.",
+            "Expand within 30 days, split revenue 50-50 (₹6,000/month each), share responsibilities and risks."
+        ],
+        "score_logic": {
+            "option_1": {"risk": 8, "reward": 8, "realism": 6},
+            "option_2": {"risk": 3, "reward": 7, "realism": 9},
+            "option_3": {"risk": 4, "reward": 6, "realism": 8}
+        },
+        "event": {
+            "description": None,
+            "impact": None
+        }
+    }
+}
 
 
 class AIManager:
     """Manages AI API calls for scenario generation and translation"""
     
+    # Upper bound on provider requests in flight during a batch
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    # Seconds a generated scenario is reused for identical business data
+    SCENARIO_CACHE_TTL = 7 * 24 * 3600
+    # Exact-match entries kept, least recently used evicted first
+    SCENARIO_CACHE_SIZE = 256
+    
+    # Near-duplicate reuse: same business type and round, and cosine similarity of
+    # the remaining business fields at or above the threshold
+    SEMANTIC_CACHE_THRESHOLD = 0.9
+    SEMANTIC_CACHE_SIZE = 256
+    
+    # Output token budget per translated string, and strings sent per batch prompt;
+    # Indic scripts take several tokens per word, so the budget scales with the batch
+    TRANSLATION_MAX_TOKENS = 500
+    TRANSLATION_BATCH_SIZE = 7
+    
+    # Pooled keep-alive connections, with backoff retries on connection failures and on
+    # throttling and gateway errors; read timeouts are not retried, since the POST may
+    # already have been processed (and billed) and a retry would block for another timeout
+    HTTP_POOL_SIZE = 16
+    HTTP_RETRIES = Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=None,
+        raise_on_status=False
+    )
+    
     def __init__(self, provider: str = "huggingface"):
         self.provider = provider
         self.config = AI_PROVIDERS.get(provider, AI_PROVIDERS["huggingface"])
         self.api_key = self._get_api_key()
+        self._scenario_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._semantic_cache: deque = deque(maxlen=self.SEMANTIC_CACHE_SIZE)
+        # One manager serves every session, so the scenario caches are shared across threads
+        self._cache_lock = threading.Lock()
+        self._translation_cache: Dict[str, str] = {}
+        self._session = self._build_session()
+    
+    def _build_session(self) -> requests.Session:
+        """HTTP session shared by all provider calls"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.HTTP_POOL_SIZE,
+            pool_maxsize=self.HTTP_POOL_SIZE,
+            max_retries=self.HTTP_RETRIES
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
     
     def _get_api_key(self) -> Optional[str]:
         """Retrieve API key from environment or Streamlit secrets"""
-        env_key = self.config["env_key"]
+        return _load_api_key(self.config["env_key"])
+    
+    def generate_scenario(self, business_data: Dict[str, Any], use_cache: bool = True,
+                          raise_errors: bool = False) -> Dict[str, Any]:
+        """Generate a business scenario using AI; use_cache=False always asks the provider
         
-        # Try Streamlit secrets first
-        try:
-            if hasattr(st, 'secrets') and env_key in st.secrets:
-                return st.secrets[env_key]
-        except:
-            pass
+        Provider errors are shown and answered with the fallback scenario, or
+        re-raised when raise_errors is set so callers can avoid caching the fallback.
+        """
+        
+        if not self.api_key:
+            return self.get_fallback_scenario(business_data)
         
-        # Fall back to environment variable
-        return os.getenv(env_key)
+        key, cached = self._lookup_scenario(business_data) if use_cache else (self._scenario_cache_key(business_data), None)
+        if cached is not None:
+            return cached
+        
+        prompt = self._build_scenario_prompt(business_data)
+        
+        try:
+            return self._store_scenario(key, business_data, self._request_scenario(prompt, business_data))
+        except Exception as e:
+            if raise_errors:
+                raise
+            st.error(f"AI API Error: {str(e)}")
+            return self.get_fallback_scenario(business_data)
     
-    def generate_scenario(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate a business scenario using AI"""
+    async def agenerate_scenario(self, business_data: Dict[str, Any], use_cache: bool = True,
+                                 raise_errors: bool = False) -> Dict[str, Any]:
+        """Async variant of generate_scenario; the HTTP call runs in a worker thread"""
         
         if not self.api_key:
-            return self._get_fallback_scenario(business_data)
+            return self.get_fallback_scenario(business_data)
+        
+        key, cached = self._lookup_scenario(business_data) if use_cache else (self._scenario_cache_key(business_data), None)
+        if cached is not None:
+            return cached
+        
+        prompt = self._build_scenario_prompt(business_data)
+        
+        try:
+            scenario = await asyncio.to_thread(self._request_scenario, prompt, business_data)
+            return self._store_scenario(key, business_data, scenario)
+        except Exception as e:
+            if raise_errors:
+                raise
+            st.error(f"AI API Error: {str(e)}")
+            return self.get_fallback_scenario(business_data)
+    
+    async def agenerate_scenarios(self, businesses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate scenarios for several businesses concurrently, in input order"""
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        
+        async def generate(business_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.agenerate_scenario(business_data)
+        
+        return list(await asyncio.gather(*(generate(b) for b in businesses)))
+    
+    def generate_scenarios_batch(self, businesses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Blocking wrapper around agenerate_scenarios for Streamlit callers"""
+        return asyncio.run(self.agenerate_scenarios(businesses))
+    
+    def _scenario_cache_key(self, business_data: Dict[str, Any]) -> str:
+        """Hash the business data together with the provider and model"""
+        payload = _dumps(
+            {**business_data, "_p": self.provider, "_m": self.config["model"]},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _scenario_bucket(self, business_data: Dict[str, Any]) -> tuple:
+        """Fields a reused scenario must match exactly"""
+        return (self.provider, self.config["model"], business_data.get('business_type'), business_data.get('round', 1))
+    
+    @staticmethod
+    def _scenario_vector(business_data: Dict[str, Any]) -> Counter:
+        """Bag of lower-cased word tokens from the fuzzy-matched business fields"""
+        text = " ".join([
+            str(business_data.get('location', '')),
+            str(business_data.get('employment_mode', '')),
+            str(business_data.get('capital', '')),
+            _dumps(business_data.get('resources', {}), sort_keys=True)
+        ])
+        return Counter(re.findall(r"\w+", text.lower()))
+    
+    def _lookup_scenario(self, business_data: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Return the exact cache key and a copy of a fresh exact or near-duplicate scenario"""
+        key = self._scenario_cache_key(business_data)
+        now = time.time()
+        
+        with self._cache_lock:
+            entry = self._scenario_cache.get(key)
+            if entry is not None:
+                stored_at, scenario = entry
+                if now - stored_at <= self.SCENARIO_CACHE_TTL:
+                    self._scenario_cache.move_to_end(key)
+                    return key, copy.deepcopy(scenario)
+                self._scenario_cache.pop(key, None)
+            semantic_entries = list(self._semantic_cache)
         
-        prompt = SCENARIO_PROMPT_TEMPLATE.format(
+        bucket = self._scenario_bucket(business_data)
+        vector = self._scenario_vector(business_data)
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        if not norm:
+            return key, None
+        
+        for stored_at, entry_bucket, entry_vector, entry_norm, scenario in reversed(semantic_entries):
+            if entry_bucket != bucket or now - stored_at > self.SCENARIO_CACHE_TTL:
+                continue
+            dot = sum(count * entry_vector[token] for token, count in vector.items())
+            if dot / (norm * entry_norm) >= self.SEMANTIC_CACHE_THRESHOLD:
+                return key, copy.deepcopy(scenario)
+        return key, None
+    
+    def _store_scenario(self, key: str, business_data: Dict[str, Any], scenario: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a generated scenario under its exact key and for near-duplicate lookup"""
+        now = time.time()
+        stored = copy.deepcopy(scenario)
+        vector = self._scenario_vector(business_data)
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        
+        with self._cache_lock:
+            self._scenario_cache[key] = (now, stored)
+            self._scenario_cache.move_to_end(key)
+            while len(self._scenario_cache) > self.SCENARIO_CACHE_SIZE:
+                self._scenario_cache.popitem(last=False)
+            if norm:
+                self._semantic_cache.append((now, self._scenario_bucket(business_data), vector, norm, stored))
+        return scenario
+    
+    def _build_scenario_prompt(self, business_data: Dict[str, Any]) -> str:
+        """Render the per-business part of the scenario prompt"""
+        return render_scenario_prompt(
             business_type=business_data.get('business_type', 'General Business'),
             location=business_data.get('location', 'Rural Area'),
             capital=business_data.get('capital', 50000),
-            resources=json.dumps(business_data.get('resources', {})),
+            resources=_dumps(business_data.get('resources', {})),
             employment_mode=business_data.get('employment_mode', 'Self-operated'),
             round_number=business_data.get('round', 1)
         )
-        
-        try:
-            if self.provider == "openai":
-                return self._call_openai(prompt)
-            elif self.provider == "huggingface":
-                return self._call_huggingface(prompt)
-            elif self.provider == "anthropic":
-                return self._call_anthropic(prompt)
-            else:
-                return self._get_fallback_scenario(business_data)
-        except Exception as e:
-            st.error(f"AI API Error: {str(e)}")
-            return self._get_fallback_scenario(business_data)
+    
+    def _request_scenario(self, prompt: str, business_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Send the scenario prompt to the configured provider"""
+        if self.provider == "openai":
+            return self._call_openai(prompt)
+        elif self.provider == "huggingface":
+            return self._call_huggingface(prompt)
+        elif self.provider == "anthropic":
+            return self._call_anthropic(prompt)
+        else:
+            return self.get_fallback_scenario(business_data)
     
     def _call_openai(self, prompt: str) -> Dict[str, Any]:
         """Call OpenAI API"""
@@ -67,17 +365,18 @@ class AIManager:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # The static preamble goes first so OpenAI's automatic prefix caching can reuse it
         data = {
             "model": self.config["model"],
             "messages": [
-                {"role": "system", "content": "You are a rural business education expert. Return only valid JSON."},
+                {"role": "system", "content": SCENARIO_SYSTEM_PREAMBLE},
                 {"role": "user", "content": prompt}
             ],
             "temperature": 0.7,
             "max_tokens": 1000
         }
         
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = self._session.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -94,7 +393,7 @@ class AIManager:
             "Content-Type": "application/json"
         }
         data = {
-            "inputs": prompt,
+            "inputs": SCENARIO_SYSTEM_PREAMBLE + prompt,
             "parameters": {
                 "temperature": 0.7,
                 "max_new_tokens": 1000,
@@ -102,7 +401,7 @@ class AIManager:
             }
         }
         
-        response = requests.post(url, headers=headers, json=data, timeout=60)
+        response = self._session.post(url, headers=headers, json=data, timeout=60)
         response.raise_for_status()
         
         result = response.json()
@@ -122,8 +421,12 @@ class AIManager:
             "anthropic-version": "2023-06-01",
             "Content-Type": "application/json"
         }
+        # The static preamble is marked cacheable, so only the business details are new per call
         data = {
             "model": self.config["model"],
+            "system": [
+                {"type": "text", "text": SCENARIO_SYSTEM_PREAMBLE, "cache_control": {"type": "ephemeral"}}
+            ],
             "messages": [
                 {"role": "user", "content": prompt}
             ],
@@ -131,7 +434,7 @@ class AIManager:
             "temperature": 0.7
         }
         
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = self._session.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -141,22 +444,36 @@ class AIManager:
     
     def _extract_json(self, text: str) -> Dict[str, Any]:
         """Extract JSON from AI response"""
+        text = text.strip()
+        
+        # Try direct JSON parse
         try:
-            # Try direct JSON parse
-            return json.loads(text)
+            return _loads(text)
         except json.JSONDecodeError:
-            # Try to find JSON in markdown code blocks
-            import re
-            json_match = re.search(r'```json\s*(\{.*?\})\s*```', text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(1))
-            
-            # Try to find JSON object
-            json_match = re.search(r'\{.*\}', text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
-            
-            raise ValueError("Could not extract valid JSON from AI response")
+            pass
+        
+        # Try to find JSON in a markdown code block
+        json_match = _FENCE_RE.search(text)
+        if json_match:
+            try:
+                return _loads(json_match.group(1))
+            except json.JSONDecodeError:
+                pass
+        
+        # Try the first balanced JSON object
+        candidate = _find_json_object(text)
+        if candidate:
+            try:
+                return _loads(candidate)
+            except json.JSONDecodeError:
+                pass
+        
+        # Last resort: everything between the outermost braces
+        json_match = _OBJ_RE.search(text)
+        if json_match:
+            return _loads(json_match.group(0))
+        
+        raise ValueError("Could not extract valid JSON from AI response")
     
     def translate_text(self, text: str, target_language: str) -> str:
         """Translate text to target language"""
@@ -164,25 +481,112 @@ class AIManager:
         if target_language == "English" or not self.api_key:
             return text
         
-        prompt = TRANSLATION_PROMPT_TEMPLATE.format(
-            language=target_language,
-            text=text
-        )
+        return self.translate_batch([text], target_language)[0]
+    
+    @staticmethod
+    def _translation_key(text: str, target_language: str) -> str:
+        """Hash of a string and its target language"""
+        return hashlib.sha256(f"{text}|{target_language}".encode('utf-8')).hexdigest()
+    
+    def translate_batch(self, texts: List[str], target_language: str) -> List[str]:
+        """Translate several strings with one provider call, caching each result"""
         
-        try:
-            if self.provider == "openai":
-                result = self._call_openai_simple(prompt)
-            elif self.provider == "huggingface":
-                result = self._call_huggingface_simple(prompt)
-            else:
-                return text
+        if target_language == "English" or not self.api_key:
+            return list(texts)
+        
+        translated, errors = self._translate_batch(texts, target_language)
+        for error in errors:
+            st.warning(f"Translation failed: {error}")
+        return translated
+    
+    def _translate_batch(self, texts: List[str], target_language: str) -> Tuple[List[str], List[str]]:
+        """Translate texts, returning the results and any error messages
+        
+        Makes no Streamlit calls, so it can run in a worker thread; the caller
+        reports the errors from the script thread.
+        """
+        errors = []
+        keys = [self._translation_key(text, target_language) for text in texts]
+        missing = list(dict.fromkeys(
+            text for text, key in zip(texts, keys) if text and key not in self._translation_cache
+        ))
+        
+        for start in range(0, len(missing), self.TRANSLATION_BATCH_SIZE):
+            chunk = missing[start:start + self.TRANSLATION_BATCH_SIZE]
+            try:
+                if len(chunk) == 1:
+                    prompt = TRANSLATION_PROMPT_TEMPLATE.format(language=target_language, text=chunk[0])
+                    translated = [self._request_translation(prompt, chunk[0])]
+                else:
+                    translated = self._request_translation_batch(chunk, target_language)
+            except Exception as e:
+                errors.append(str(e))
+                translated = [None] * len(chunk)
             
-            return result
-        except Exception as e:
-            st.warning(f"Translation failed: {str(e)}")
+            for text, result in zip(chunk, translated):
+                if result:
+                    self._translation_cache[self._translation_key(text, target_language)] = result
+        
+        return [self._translation_cache.get(key, text) for text, key in zip(texts, keys)], errors
+    
+    def _request_translation_batch(self, texts: List[str], target_language: str) -> List[Optional[str]]:
+        """Translate numbered lines in one prompt; lines missing from the reply come back as None"""
+        lines = "\n".join(f"{i}) {' '.join(text.split())}" for i, text in enumerate(texts, 1))
+        prompt = BATCH_TRANSLATION_PROMPT_TEMPLATE.format(language=target_language, lines=lines)
+        
+        response = self._request_translation(prompt, "", self.TRANSLATION_MAX_TOKENS * len(texts))
+        numbered = {int(num): line for num, line in _NUMBERED_LINE_RE.findall(response)}
+        return [numbered.get(i) or None for i in range(1, len(texts) + 1)]
+    
+    async def atranslate(self, text: str, target_language: str) -> str:
+        """Async variant of translate_text; the HTTP call runs in a worker thread"""
+        return (await self.atranslate_batch([text], target_language))[0]
+    
+    async def atranslate_batch(self, texts: List[str], target_language: str,
+                               raise_errors: bool = False) -> List[str]:
+        """Async variant of translate_batch; raise_errors raises instead of warning on failure"""
+        
+        if target_language == "English" or not self.api_key:
+            return list(texts)
+        
+        translated, errors = await asyncio.to_thread(self._translate_batch, texts, target_language)
+        if errors and raise_errors:
+            raise RuntimeError("; ".join(errors))
+        # Reported here because the worker thread has no Streamlit script context
+        for error in errors:
+            st.warning(f"Translation failed: {error}")
+        return translated
+    
+    async def atranslate_scenario(self, scenario: Dict[str, Any], target_language: str,
+                                  raise_errors: bool = False) -> Dict[str, Any]:
+        """Translate a scenario's description, options and consequences in one batch"""
+        
+        if target_language == "English" or not self.api_key:
+            return scenario
+        
+        options = scenario.get('options', [])
+        consequences = scenario.get('consequences', [])
+        texts = [scenario.get('scenario', ''), *options, *consequences]
+        
+        translated = await self.atranslate_batch(texts, target_language, raise_errors=raise_errors)
+        
+        return {
+            **scenario,
+            "scenario": translated[0],
+            "options": translated[1:1 + len(options)],
+            "consequences": translated[1 + len(options):]
+        }
+    
+    def _request_translation(self, prompt: str, text: str, max_tokens: int = TRANSLATION_MAX_TOKENS) -> str:
+        """Send the translation prompt to the configured provider"""
+        if self.provider == "openai":
+            return self._call_openai_simple(prompt, max_tokens)
+        elif self.provider == "huggingface":
+            return self._call_huggingface_simple(prompt, max_tokens)
+        else:
             return text
     
-    def _call_openai_simple(self, prompt: str) -> str:
+    def _call_openai_simple(self, prompt: str, max_tokens: int = TRANSLATION_MAX_TOKENS) -> str:
         """Simple OpenAI call for translation"""
         url = f"{self.config['api_base']}/chat/completions"
         headers = {
@@ -193,15 +597,15 @@ class AIManager:
             "model": "gpt-3.5-turbo",
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.3,
-            "max_tokens": 500
+            "max_tokens": max_tokens
         }
         
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = self._session.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         
         return response.json()['choices'][0]['message']['content']
     
-    def _call_huggingface_simple(self, prompt: str) -> str:
+    def _call_huggingface_simple(self, prompt: str, max_tokens: int = TRANSLATION_MAX_TOKENS) -> str:
         """Simple Hugging Face call for translation"""
         url = f"{self.config['api_base']}/{self.config['model']}"
         headers = {
@@ -212,12 +616,12 @@ class AIManager:
             "inputs": prompt,
             "parameters": {
                 "temperature": 0.3,
-                "max_new_tokens": 500,
+                "max_new_tokens": max_tokens,
                 "return_full_text": False
             }
         }
         
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = self._session.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -227,55 +631,9 @@ class AIManager:
         else:
             return result.get('generated_text', '')
     
-    def _get_fallback_scenario(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
+    def get_fallback_scenario(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
         """Return a hardcoded scenario when AI is unavailable"""
         business_type = business_data.get('business_type', 'General Business')
         
-        scenarios = {
-            "Dairy Farming": {
-                "scenario": "Your dairy farm has been producing 40 liters of milk daily. A nearby cooperative offers to buy your entire production at ₹35/liter, but a new ice cream factory is willing to pay ₹45/liter if you can increase production to 60 liters daily. Your current setup needs investment to scale.",
-                "options": [
-                    "Accept the cooperative's stable offer and continue current production",
-                    "Invest ₹30,000 in 2 more cows and equipment to meet factory demand",
-                    "Split production: 40L to cooperative, invest slowly to scale for factory later"
-                ],
-                "consequences": [
-                    "Steady income of ₹42,000/month but limited growth potential. Low risk, moderate reward.",
-                    "Potential ₹81,000/month if successful, but ₹30,000 upfront risk and 2-month ramp-up time.",
-                    "Balanced approach: ₹42,000/month now, gradual scaling. Medium risk, growing reward."
-                ],
-                "score_logic": {
-                    "option_1": {"risk": 2, "reward": 5, "realism": 9},
-                    "option_2": {"risk": 8, "reward": 9, "realism": 7},
-                    "option_3": {"risk": 4, "reward": 7, "realism": 8}
-                },
-                "event": {
-                    "description": "Monsoon forecast shows heavy rains next month which could affect fodder supply",
-                    "impact": "May need to purchase additional fodder at 30% higher cost"
-                }
-            },
-            "Solar Leasing": {
-                "scenario": "You've installed 10 solar panels and are leasing to 5 households at ₹1,200/month each. A village school wants to lease 10 more panels, but you'll need ₹150,000 for expansion. A government subsidy covers 40% if you apply within 30 days.",
-                "options": [
-                    "Take a bank loan for full ₹150,000 at 12% interest",
-                    "Apply for government subsidy, save ₹90,000, then expand",
-                    "Partner with another solar entrepreneur to share costs and profits"
-                ],
-                "consequences": [
-                    "Immediate expansion, ₹12,000/month revenue, but ₹18,000 interest annually. High debt risk.",
-                    "Wait 45 days for subsidy approval, only ₹90,000 loan needed, ₹10,800/year interest. Delayed but safer.",
-                    "Expand within 30 days, split revenue 50-50 (₹6,000/month each), share responsibilities and risks."
-                ],
-                "score_logic": {
-                    "option_1": {"risk": 8, "reward": 8, "realism": 6},
-                    "option_2": {"risk": 3, "reward": 7, "realism": 9},
-                    "option_3": {"risk": 4, "reward": 6, "realism": 8}
-                },
-                "event": {
-                    "description": None,
-                    "impact": None
-                }
-            }
-        }
-        
-        return scenarios.get(business_type, scenarios["Dairy Farming"])
+        # The shared constant itself; callers that modify a scenario copy it first
+        return FALLBACK_SCENARIOS.get(business_type, FALLBACK_SCENARIOS["Dairy Farming"])
@@ -2,20 +2,167 @@
 Database Manager for storing and retrieving game data
 """
 
+import atexit
+import heapq
 import json
 import os
-from datetime import datetime
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Fixed-schema scenario results are logged as packed binary records:
+# id lengths, round, score, option, risk, reward, realism, timestamp (microseconds
+# since _EPOCH), followed by the UTF-8 scenario id and business id
+_SCN_RECORD = struct.Struct("<BBIiBBBBq")
+_SCN_FIELDS = ("round", "score", "option_selected", "risk", "reward", "realism")
+_SCN_KEYS = frozenset(_SCN_FIELDS + ("business_id", "timestamp"))
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _pack_scenario(scenario_id: str, scenario: Dict[str, Any]) -> Optional[bytes]:
+    """Pack a scenario result, or return None if it does not fit the fixed schema"""
+    if scenario.keys() != _SCN_KEYS:
+        return None
+    try:
+        sid = scenario_id.encode('utf-8')
+        bid = scenario["business_id"].encode('utf-8')
+        ts = (datetime.fromisoformat(scenario["timestamp"]) - _EPOCH) // _MICROSECOND
+        values = [scenario[field] for field in _SCN_FIELDS]
+        if not all(type(v) is int for v in values):
+            return None
+        return _SCN_RECORD.pack(len(sid), len(bid), *values, ts) + sid + bid
+    except (AttributeError, TypeError, ValueError, struct.error):
+        return None
+
+
+def _unpack_scenarios(blob: bytes):
+    """Yield (scenario_id, scenario, end_offset) from packed records, stopping at a torn or garbled tail"""
+    offset = 0
+    while offset + _SCN_RECORD.size <= len(blob):
+        sid_len, bid_len, *values, ts = _SCN_RECORD.unpack_from(blob, offset)
+        start = offset + _SCN_RECORD.size
+        end = start + sid_len + bid_len
+        if end > len(blob):
+            return
+        
+        try:
+            scenario_id = blob[start:start + sid_len].decode('utf-8')
+            scenario = {
+                "business_id": blob[start + sid_len:end].decode('utf-8'),
+                "timestamp": (_EPOCH + ts * _MICROSECOND).isoformat(),
+                **dict(zip(_SCN_FIELDS, values))
+            }
+        except (OverflowError, UnicodeDecodeError, ValueError):
+            return
+        yield scenario_id, scenario, end
+        offset = end
+
+
+# Top-level collections every database document must have
+_COLLECTIONS = {
+    "users": dict,
+    "businesses": dict,
+    "scenarios": dict,
+    "leaderboard": list,
+    "auctions": dict,
+    "admin_settings": dict
+}
+
 
 class DatabaseManager:
-    """Manages data persistence for the game"""
+    """Manages data persistence for the game
+    
+    The database is held in memory. Every mutation is appended to a
+    JSON-lines write-ahead log (WAL) next to the snapshot file, and the
+    snapshot is rewritten ("compacted") by a background thread once the
+    WAL holds COMPACT_THRESHOLD records, and at shutdown. Scenario results,
+    which have a fixed schema, go to a second, struct-packed log instead of
+    the JSON one.
+    """
+    
+    # Seconds a burst of writes is coalesced before the background thread runs
+    FLUSH_INTERVAL = 0.5
+    
+    # WAL records accumulated before the snapshot is rewritten
+    COMPACT_THRESHOLD = 1000
+    
+    # Number of entries kept on the leaderboard
+    LEADERBOARD_SIZE = 100
+    
+    # Most recent bids kept on each auction
+    MAX_AUCTION_BIDS = 100
+    
+    # One manager per database file, so every page shares the same state and WAL
+    _instances: Dict[Path, "DatabaseManager"] = {}
+    _instances_lock = threading.Lock()
+    
+    def __new__(cls, db_path: str = "data/game_data.json"):
+        key = Path(db_path).resolve()
+        with cls._instances_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance._initialized = False
+                cls._instances[key] = instance
+        return instance
     
     def __init__(self, db_path: str = "data/game_data.json"):
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._initialize_db()
+        with self._instances_lock:
+            if self._initialized:
+                return
+            
+            self.db_path = Path(db_path)
+            self.wal_path = self.db_path.with_name(f"{self.db_path.stem}.wal.jsonl")
+            self.scn_wal_path = self.db_path.with_name(f"{self.db_path.stem}.scn.wal")
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            self._lock = threading.RLock()
+            self._initialize_db()
+            self._data = self._load_snapshot()
+            self._wal_records = self._replay_scenario_wal() + self._replay_wal()
+            self._build_indexes()
+            self._pending: Dict[tuple, str] = {}
+            # Bumped on every mutation; pages use it as a cache key
+            self._version = 0
+            # Min-heap of (score, seq, entry) capped at LEADERBOARD_SIZE
+            self._lb_buffer: List[tuple] = []
+            self._lb_seq = 0
+            self._last_id = 0
+            self._batch_depth = 0
+            self._dirty_evt = threading.Event()
+            self._wal = open(self.wal_path, 'ab')
+            self._scn_wal = open(self.scn_wal_path, 'ab')
+            
+            atexit.register(self.compact)
+            threading.Thread(target=self._flush_loop, daemon=True).start()
+            
+            self._initialized = True
     
     def _initialize_db(self):
         """Initialize database file if it doesn't exist"""
@@ -32,262 +179,597 @@ class DatabaseManager:
                     "event_probabilities": {}
                 }
             }
-            self._write_data(initial_data)
+            self._write_snapshot(initial_data)
     
-    def _read_data(self) -> Dict[str, Any]:
-        """Read data from JSON file"""
+    def _load_snapshot(self) -> Dict[str, Any]:
+        """Read the snapshot from the JSON file"""
         try:
-            with open(self.db_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _loads(self.db_path.read_bytes())
         except Exception as e:
             print(f"Error reading database: {e}")
             return {}
     
-    def _write_data(self, data: Dict[str, Any]):
-        """Write data to JSON file"""
+    def _write_snapshot(self, data: Dict[str, Any]) -> bool:
+        """Write the snapshot to the JSON file
+        
+        The data goes to a temporary file that is synced and then renamed over
+        the snapshot, so a crash never leaves a half-written database behind.
+        """
+        tmp_path = self.db_path.with_suffix(".tmp")
         try:
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps(data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.db_path)
+            return True
         except Exception as e:
             print(f"Error writing database: {e}")
+            return False
     
-    # User Management
-    def create_user(self, user_name: str, language: str = "English") -> str:
-        """Create a new user and return user_id"""
-        data = self._read_data()
+    @property
+    def version(self) -> int:
+        """Counter bumped on every mutation, usable as a cache key"""
+        return self._version
+    
+    def _read_data(self) -> Dict[str, Any]:
+        """Return a copy of the database, safe to iterate while other sessions write"""
+        with self._lock:
+            self._merge_leaderboard()
+            return _loads(_dumps(self._data))
+    
+    def _write_data(self, data: Dict[str, Any]):
+        """Replace the whole database and persist it immediately"""
+        with self._lock:
+            self._data = data
+            self._lb_buffer.clear()
+            self._build_indexes()
+            self._version += 1
+            self._checkpoint()
+    
+    def export_json(self) -> bytes:
+        """Serialize the whole database as indented JSON"""
+        with self._lock:
+            self._merge_leaderboard()
+            return _dumps(self._data, indent=True)
+    
+    def import_json(self, raw: bytes):
+        """Replace the whole database with the given JSON document
         
-        user_id = f"user_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{user_name.replace(' ', '_')}"
+        Raises ValueError, leaving the live data untouched, if the document
+        does not have the database's top-level collections.
+        """
+        data = _loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object at the top level")
+        for key, kind in _COLLECTIONS.items():
+            if not isinstance(data.get(key), kind):
+                raise ValueError(f"'{key}' must be a JSON {'object' if kind is dict else 'array'}")
+        self._write_data(data)
+    
+    # Write-ahead log
+    def _log(self, op: str, *path: str):
+        """Record a "set" or "del" of the given path in the WAL"""
+        self._version += 1
+        # Re-insert so the record moves after anything logged before it
+        self._pending.pop(path, None)
+        self._pending[path] = op
+        if not self._batch_depth:
+            self._flush_pending()
+    
+    def _flush_pending(self):
+        """Write buffered WAL records with a single fsync"""
+        if not self._pending:
+            return
         
-        data["users"][user_id] = {
-            "name": user_name,
-            "language": language,
-            "created_at": datetime.now().isoformat(),
-            "total_score": 0,
-            "games_played": 0,
-            "achievements": []
-        }
+        lines = []
+        packed = []
+        for path, op in self._pending.items():
+            record = {"op": op, "path": list(path)}
+            if op == "set":
+                value = self._data
+                for part in path:
+                    value = value[part]
+                if len(path) == 2 and path[0] == "scenarios":
+                    scenario = _pack_scenario(path[1], value)
+                    if scenario is not None:
+                        packed.append(scenario)
+                        continue
+                record["value"] = value
+            lines.append(_dumps(record) + b"\n")
+        self._pending.clear()
         
-        self._write_data(data)
-        return user_id
+        try:
+            for log, chunks in ((self._wal, lines), (self._scn_wal, packed)):
+                if chunks:
+                    log.write(b"".join(chunks))
+                    log.flush()
+                    os.fsync(log.fileno())
+            self._wal_records += len(lines) + len(packed)
+            self._dirty_evt.set()
+        except Exception as e:
+            print(f"Error writing database log: {e}")
+    
+    @contextmanager
+    def batch(self):
+        """Group several mutations into one WAL write
+        
+        Paths touched more than once inside the batch are logged once,
+        with their final value.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush_pending()
+    
+    def _apply(self, record: Dict[str, Any]):
+        """Apply a single WAL record to the in-memory database"""
+        *parents, key = record["path"]
+        target = self._data
+        for part in parents:
+            target = target.setdefault(part, {})
+        
+        if record["op"] == "set":
+            target[key] = record["value"]
+        elif record["op"] == "del":
+            target.pop(key, None)
+    
+    def _replay_scenario_wal(self) -> int:
+        """Replay packed scenario results; they are only ever inserted, so this runs first"""
+        if not self.scn_wal_path.exists():
+            return 0
+        
+        blob = self.scn_wal_path.read_bytes()
+        scenarios = self._data.setdefault("scenarios", {})
+        count = 0
+        good = 0
+        for scenario_id, scenario, good in _unpack_scenarios(blob):
+            scenarios[scenario_id] = scenario
+            count += 1
+        
+        # Drop a torn tail so new records are not appended after a partial one
+        if good < len(blob):
+            os.truncate(self.scn_wal_path, good)
+        return count
+    
+    def _replay_wal(self) -> int:
+        """Replay WAL records written since the last compaction"""
+        if not self.wal_path.exists():
+            return 0
+        
+        count = 0
+        good = 0
+        with open(self.wal_path, 'rb') as f:
+            for line in f:
+                # A record is only complete once its newline is on disk
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = _loads(line)
+                except ValueError:
+                    # A torn record from an interrupted write
+                    break
+                self._apply(record)
+                count += 1
+                good += len(line)
+        
+        # Drop a torn tail so new records are not appended onto a partial line
+        if good < self.wal_path.stat().st_size:
+            os.truncate(self.wal_path, good)
+        return count
+    
+    def _checkpoint(self):
+        """Write the snapshot and truncate the WAL it now covers"""
+        if self._write_snapshot(self._data):
+            for log in (self._wal, self._scn_wal):
+                log.truncate(0)
+                log.flush()
+                os.fsync(log.fileno())
+            self._wal_records = 0
+    
+    def compact(self, threshold: int = 1):
+        """Fold pending WAL records into the JSON snapshot once there are at least threshold"""
+        with self._lock:
+            self._merge_leaderboard()
+            if self._wal_records >= threshold:
+                self._checkpoint()
+    
+    def _flush_loop(self):
+        """Background thread merging the leaderboard after writes and compacting large WALs"""
+        while True:
+            self._dirty_evt.wait()
+            time.sleep(self.FLUSH_INTERVAL)
+            self._dirty_evt.clear()
+            self.compact(self.COMPACT_THRESHOLD)
+    
+    def _next_id(self, prefix: str) -> str:
+        """Unique, increasing id: microseconds since the epoch, bumped past the last one issued"""
+        with self._lock:
+            self._last_id = max(time.time_ns() // 1000, self._last_id + 1)
+            return f"{prefix}_{self._last_id}"
+    
+    # User Management
+    def create_user(self, user_name: str, language: str = "English") -> str:
+        """Create a new user and return user_id"""
+        with self._lock:
+            user_id = f"{self._next_id('user')}_{user_name.replace(' ', '_')}"
+            
+            self._data["users"][user_id] = {
+                "name": user_name,
+                "language": language,
+                "created_at": datetime.now().isoformat(),
+                "total_score": 0,
+                "games_played": 0,
+                "achievements": []
+            }
+            
+            self._log("set", "users", user_id)
+            return user_id
     
     def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user data"""
-        data = self._read_data()
-        return data["users"].get(user_id)
+        with self._lock:
+            user = self._data["users"].get(user_id)
+            return dict(user) if user is not None else None
     
     def update_user_score(self, user_id: str, score: int):
         """Update user's total score"""
-        data = self._read_data()
-        if user_id in data["users"]:
-            data["users"][user_id]["total_score"] += score
-            data["users"][user_id]["games_played"] += 1
-            self._write_data(data)
+        with self._lock:
+            if user_id in self._data["users"]:
+                self._data["users"][user_id]["total_score"] += score
+                self._data["users"][user_id]["games_played"] += 1
+                self._games_played += 1
+                self._log("set", "users", user_id)
     
     # Business Management
     def create_business(self, user_id: str, business_data: Dict[str, Any]) -> str:
         """Create a new business"""
-        data = self._read_data()
-        
-        business_id = f"biz_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        data["businesses"][business_id] = {
-            "user_id": user_id,
-            "created_at": datetime.now().isoformat(),
-            "current_round": 1,
-            "total_score": 0,
-            "status": "active",
-            **business_data
-        }
-        
-        self._write_data(data)
-        return business_id
+        with self._lock:
+            business_id = self._next_id("biz")
+            
+            self._data["businesses"][business_id] = {
+                "user_id": user_id,
+                "created_at": datetime.now().isoformat(),
+                "current_round": 1,
+                "total_score": 0,
+                "status": "active",
+                **business_data
+            }
+            self._businesses_by_user.setdefault(user_id, {})[business_id] = None
+            
+            self._log("set", "businesses", business_id)
+            return business_id
     
     def get_business(self, business_id: str) -> Optional[Dict[str, Any]]:
         """Get business data"""
-        data = self._read_data()
-        return data["businesses"].get(business_id)
+        with self._lock:
+            business = self._data["businesses"].get(business_id)
+            return dict(business) if business is not None else None
     
     def update_business(self, business_id: str, updates: Dict[str, Any]):
         """Update business data"""
-        data = self._read_data()
-        if business_id in data["businesses"]:
-            data["businesses"][business_id].update(updates)
-            data["businesses"][business_id]["updated_at"] = datetime.now().isoformat()
-            self._write_data(data)
+        with self._lock:
+            if business_id in self._data["businesses"]:
+                if "user_id" in updates:
+                    old_user = self._data["businesses"][business_id].get("user_id")
+                    self._businesses_by_user.get(old_user, {}).pop(business_id, None)
+                    self._businesses_by_user.setdefault(updates["user_id"], {})[business_id] = None
+                self._data["businesses"][business_id].update(updates)
+                self._data["businesses"][business_id]["updated_at"] = datetime.now().isoformat()
+                self._log("set", "businesses", business_id)
     
     def get_user_businesses(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all businesses for a user"""
-        data = self._read_data()
-        return [
-            {**biz, "business_id": biz_id}
-            for biz_id, biz in data["businesses"].items()
-            if biz.get("user_id") == user_id
-        ]
+        with self._lock:
+            businesses = self._data["businesses"]
+            return [
+                {**businesses[biz_id], "business_id": biz_id}
+                for biz_id in self._businesses_by_user.get(user_id, ())
+            ]
     
     # Scenario Management
     def save_scenario(self, business_id: str, scenario_data: Dict[str, Any]) -> str:
         """Save a scenario result"""
-        data = self._read_data()
-        
-        scenario_id = f"scen_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        data["scenarios"][scenario_id] = {
-            "business_id": business_id,
-            "timestamp": datetime.now().isoformat(),
-            **scenario_data
-        }
-        
-        self._write_data(data)
-        return scenario_id
+        with self._lock:
+            scenario_id = self._next_id("scen")
+            
+            self._data["scenarios"][scenario_id] = {
+                "business_id": business_id,
+                "timestamp": datetime.now().isoformat(),
+                **scenario_data
+            }
+            self._scenarios_by_business.setdefault(business_id, {})[scenario_id] = None
+            
+            self._log("set", "scenarios", scenario_id)
+            return scenario_id
+    
+    def get_scenarios(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get the first limit scenarios, oldest first"""
+        with self._lock:
+            return [
+                {**scen, "scenario_id": scen_id}
+                for scen_id, scen in islice(self._data["scenarios"].items(), limit)
+            ]
     
     def get_business_scenarios(self, business_id: str) -> List[Dict[str, Any]]:
         """Get all scenarios for a business"""
-        data = self._read_data()
-        return [
-            {**scen, "scenario_id": scen_id}
-            for scen_id, scen in data["scenarios"].items()
-            if scen.get("business_id") == business_id
-        ]
+        with self._lock:
+            scenarios = self._data["scenarios"]
+            return [
+                {**scenarios[scen_id], "scenario_id": scen_id}
+                for scen_id in self._scenarios_by_business.get(business_id, ())
+            ]
+    
+    def delete_scenario(self, scenario_id: str) -> bool:
+        """Delete a scenario result"""
+        with self._lock:
+            if scenario_id not in self._data["scenarios"]:
+                return False
+            self._unindex_scenario(scenario_id)
+            del self._data["scenarios"][scenario_id]
+            self._log("del", "scenarios", scenario_id)
+            return True
+    
+    def _unindex_scenario(self, scenario_id: str):
+        """Drop an existing scenario from the by-business index"""
+        scenario = self._data["scenarios"].get(scenario_id)
+        if scenario is not None:
+            self._scenarios_by_business.get(scenario.get("business_id"), {}).pop(scenario_id, None)
     
     # Leaderboard
     def update_leaderboard(self, user_id: str, score: int, business_type: str):
         """Update leaderboard with new score"""
-        data = self._read_data()
-        user = data["users"].get(user_id, {})
-        
-        entry = {
-            "user_id": user_id,
-            "user_name": user.get("name", "Unknown"),
-            "score": score,
-            "business_type": business_type,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        data["leaderboard"].append(entry)
-        
-        # Keep only top 100 entries
-        data["leaderboard"] = sorted(
-            data["leaderboard"],
-            key=lambda x: x["score"],
-            reverse=True
-        )[:100]
+        with self._lock:
+            user = self._data["users"].get(user_id, {})
+            
+            entry = {
+                "user_id": user_id,
+                "user_name": user.get("name", "Unknown"),
+                "score": score,
+                "business_type": business_type,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+            # Buffered and merged by the flush thread, so a round costs no leaderboard write;
+            # the buffer is a bounded min-heap, so only scores that could place are kept
+            self._lb_seq += 1
+            item = (score, self._lb_seq, entry)
+            if len(self._lb_buffer) < self.LEADERBOARD_SIZE:
+                heapq.heappush(self._lb_buffer, item)
+            else:
+                heapq.heappushpop(self._lb_buffer, item)
+            self._dirty_evt.set()
+    
+    def _merge_leaderboard(self):
+        """Fold buffered entries into the leaderboard and log it once"""
+        if not self._lb_buffer:
+            return
         
-        self._write_data(data)
+        # Stored as a plain list sorted by score, highest first
+        self._data["leaderboard"] = heapq.nlargest(
+            self.LEADERBOARD_SIZE,
+            self._data["leaderboard"] + [entry for _, _, entry in self._lb_buffer],
+            key=lambda x: x["score"]
+        )
+        self._lb_buffer.clear()
+        self._log("set", "leaderboard")
     
     def get_leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get top leaderboard entries"""
-        data = self._read_data()
-        return data["leaderboard"][:limit]
+        with self._lock:
+            self._merge_leaderboard()
+            return self._data["leaderboard"][:limit]
     
     # Auction Management
     def create_auction(self, auction_data: Dict[str, Any]) -> str:
         """Create a new auction"""
-        data = self._read_data()
-        
-        auction_id = f"auct_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        data["auctions"][auction_id] = {
-            "created_at": datetime.now().isoformat(),
-            "status": "active",
-            "bids": [],
-            **auction_data
-        }
-        
-        self._write_data(data)
-        return auction_id
+        with self._lock:
+            auction_id = self._next_id("auct")
+            
+            self._data["auctions"][auction_id] = {
+                "created_at": datetime.now().isoformat(),
+                "status": "active",
+                "bids": [],
+                **auction_data
+            }
+            self._index_auction(auction_id)
+            
+            self._log("set", "auctions", auction_id)
+            return auction_id
+    
+    def create_auctions_bulk(self, auctions: List[Dict[str, Any]]) -> List[str]:
+        """Create several auctions with a single WAL write"""
+        with self.batch():
+            created_at = datetime.now().isoformat()
+            auction_ids = []
+            
+            for auction_data in auctions:
+                auction_id = self._next_id("auct")
+                self._data["auctions"][auction_id] = {
+                    "created_at": created_at,
+                    "status": "active",
+                    "bids": [],
+                    **auction_data
+                }
+                self._index_auction(auction_id)
+                self._log("set", "auctions", auction_id)
+                auction_ids.append(auction_id)
+            
+            return auction_ids
     
     def place_bid(self, auction_id: str, user_id: str, bid_amount: float):
         """Place a bid on an auction"""
-        data = self._read_data()
+        with self._lock:
+            if auction_id in self._data["auctions"]:
+                auction = self._data["auctions"][auction_id]
+                bid = {
+                    "user_id": user_id,
+                    "amount": bid_amount,
+                    "timestamp": datetime.now().isoformat()
+                }
+                bids = auction["bids"]
+                bids.append(bid)
+                self._bids_by_user.setdefault(user_id, []).append((auction_id, bid))
+                
+                # Keep only the latest bids so busy auctions (and their WAL records) stay bounded
+                if len(bids) > self.MAX_AUCTION_BIDS:
+                    for dropped in bids[:-self.MAX_AUCTION_BIDS]:
+                        user_bids = self._bids_by_user.get(dropped["user_id"], [])
+                        user_bids[:] = [entry for entry in user_bids if entry[1] is not dropped]
+                    del bids[:-self.MAX_AUCTION_BIDS]
+                
+                # Update highest bid
+                auction.update(current_bid=bid_amount, highest_bidder=user_id)
+                
+                self._log("set", "auctions", auction_id)
+    
+    def submit_bid(self, auction_id: str, user_id: str, business_id: str, bid_amount: float,
+                   min_increment: float = 0) -> bool:
+        """Place a bid and deduct it from the bidding business's capital in one WAL write
         
-        if auction_id in data["auctions"]:
-            data["auctions"][auction_id]["bids"].append({
-                "user_id": user_id,
-                "amount": bid_amount,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # Update highest bid
-            data["auctions"][auction_id]["current_bid"] = bid_amount
-            data["auctions"][auction_id]["highest_bidder"] = user_id
+        Returns False without writing anything if the auction is not active, the
+        bid does not beat the live current bid by min_increment, or the business
+        cannot afford it; callers may have checked against stale cached values.
+        """
+        with self.batch():
+            auction = self._data["auctions"].get(auction_id)
+            business = self._data["businesses"].get(business_id)
+            if auction is None or business is None or auction.get("status") != "active":
+                return False
+            if bid_amount < auction.get("current_bid", 0) + min_increment:
+                return False
+            if bid_amount > business.get("capital", 0):
+                return False
             
-            self._write_data(data)
+            self.place_bid(auction_id, user_id, bid_amount)
+            self.update_business(business_id, {
+                "capital": business.get("capital", 0) - bid_amount
+            })
+            return True
+    
+    def _build_indexes(self):
+        """Rebuild the in-memory secondary indexes from the loaded data
+        
+        Bids by user, business ids by user, scenario ids by business, the
+        ids of active auctions and the games-played total; ordered dicts
+        stand in for ordered sets.
+        """
+        self._bids_by_user: Dict[str, List[tuple]] = {}
+        self._businesses_by_user: Dict[str, Dict[str, None]] = {}
+        self._scenarios_by_business: Dict[str, Dict[str, None]] = {}
+        self._active_auction_ids: Dict[str, None] = {}
+        self._games_played = sum(u.get("games_played", 0) for u in self._data.get("users", {}).values())
+        
+        for auction_id, auction in self._data.get("auctions", {}).items():
+            for bid in auction.get("bids", []):
+                self._bids_by_user.setdefault(bid["user_id"], []).append((auction_id, bid))
+            if auction.get("status") == "active":
+                self._active_auction_ids[auction_id] = None
+        
+        for business_id, business in self._data.get("businesses", {}).items():
+            self._businesses_by_user.setdefault(business.get("user_id"), {})[business_id] = None
+        
+        for scenario_id, scenario in self._data.get("scenarios", {}).items():
+            self._scenarios_by_business.setdefault(scenario.get("business_id"), {})[scenario_id] = None
+    
+    def _index_auction(self, auction_id: str):
+        """Track whether an auction is active after it is created or changed"""
+        if self._data["auctions"][auction_id].get("status") == "active":
+            self._active_auction_ids[auction_id] = None
+        else:
+            self._active_auction_ids.pop(auction_id, None)
+    
+    def get_user_bids(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get a user's bids, oldest first"""
+        with self._lock:
+            return [
+                {"auction_id": auction_id, "amount": bid["amount"], "timestamp": bid["timestamp"]}
+                for auction_id, bid in self._bids_by_user.get(user_id, [])
+            ]
     
     def get_active_auctions(self) -> List[Dict[str, Any]]:
         """Get all active auctions"""
-        data = self._read_data()
-        return [
-            {**auct, "auction_id": auct_id}
-            for auct_id, auct in data["auctions"].items()
-            if auct.get("status") == "active"
-        ]
+        with self._lock:
+            auctions = self._data["auctions"]
+            return [
+                {**auctions[auct_id], "auction_id": auct_id}
+                for auct_id in self._active_auction_ids
+            ]
     
     def close_auction(self, auction_id: str):
         """Close an auction"""
-        data = self._read_data()
-        if auction_id in data["auctions"]:
-            data["auctions"][auction_id]["status"] = "closed"
-            data["auctions"][auction_id]["closed_at"] = datetime.now().isoformat()
-            self._write_data(data)
+        with self._lock:
+            if auction_id in self._data["auctions"]:
+                self._data["auctions"][auction_id]["status"] = "closed"
+                self._data["auctions"][auction_id]["closed_at"] = datetime.now().isoformat()
+                self._active_auction_ids.pop(auction_id, None)
+                self._log("set", "auctions", auction_id)
     
     # Admin Settings
     def get_admin_settings(self) -> Dict[str, Any]:
         """Get admin settings"""
-        data = self._read_data()
-        return data.get("admin_settings", {})
+        with self._lock:
+            return dict(self._data.get("admin_settings", {}))
     
     def update_admin_settings(self, settings: Dict[str, Any]):
         """Update admin settings"""
-        data = self._read_data()
-        data["admin_settings"].update(settings)
-        self._write_data(data)
+        with self._lock:
+            self._data["admin_settings"].update(settings)
+            self._log("set", "admin_settings")
     
     def add_scenario_template(self, template: Dict[str, Any]):
         """Add a custom scenario template"""
-        data = self._read_data()
-        if "scenario_templates" not in data["admin_settings"]:
-            data["admin_settings"]["scenario_templates"] = []
-        
-        data["admin_settings"]["scenario_templates"].append({
-            "id": f"tmpl_{len(data['admin_settings']['scenario_templates']) + 1}",
-            "created_at": datetime.now().isoformat(),
-            **template
-        })
-        
-        self._write_data(data)
+        with self._lock:
+            admin_settings = self._data["admin_settings"]
+            if "scenario_templates" not in admin_settings:
+                admin_settings["scenario_templates"] = []
+            
+            admin_settings["scenario_templates"].append({
+                "id": f"tmpl_{len(admin_settings['scenario_templates']) + 1}",
+                "created_at": datetime.now().isoformat(),
+                **template
+            })
+            
+            self._log("set", "admin_settings", "scenario_templates")
     
     def get_scenario_templates(self) -> List[Dict[str, Any]]:
         """Get all scenario templates"""
-        data = self._read_data()
-        return data.get("admin_settings", {}).get("scenario_templates", [])
+        with self._lock:
+            return list(self._data.get("admin_settings", {}).get("scenario_templates", []))
     
     def update_market_prices(self, prices: Dict[str, float]):
         """Update market prices"""
-        data = self._read_data()
-        if "market_prices" not in data["admin_settings"]:
-            data["admin_settings"]["market_prices"] = {}
-        
-        data["admin_settings"]["market_prices"].update(prices)
-        data["admin_settings"]["price_updated_at"] = datetime.now().isoformat()
-        self._write_data(data)
+        with self._lock:
+            admin_settings = self._data["admin_settings"]
+            if "market_prices" not in admin_settings:
+                admin_settings["market_prices"] = {}
+            
+            admin_settings["market_prices"].update(prices)
+            admin_settings["price_updated_at"] = datetime.now().isoformat()
+            self._log("set", "admin_settings")
     
     def get_market_prices(self) -> Dict[str, float]:
         """Get current market prices"""
-        data = self._read_data()
-        return data.get("admin_settings", {}).get("market_prices", {})
+        with self._lock:
+            return dict(self._data.get("admin_settings", {}).get("market_prices", {}))
     
     # Analytics
     def get_statistics(self) -> Dict[str, Any]:
         """Get overall statistics"""
-        data = self._read_data()
-        
-        return {
-            "total_users": len(data.get("users", {})),
-            "total_businesses": len(data.get("businesses", {})),
-            "total_scenarios": len(data.get("scenarios", {})),
-            "active_auctions": len([a for a in data.get("auctions", {}).values() if a.get("status") == "active"]),
-            "total_games_played": sum(u.get("games_played", 0) for u in data.get("users", {}).values())
-        }
+        with self._lock:
+            data = self._data
+            
+            return {
+                "total_users": len(data.get("users", {})),
+                "total_businesses": len(data.get("businesses", {})),
+                "total_scenarios": len(data.get("scenarios", {})),
+                "active_auctions": len(self._active_auction_ids),
+                "total_games_played": self._games_played
+            }
     
     def get_business_analytics(self, business_id: str) -> Dict[str, Any]:
         """Get analytics for a specific business"""
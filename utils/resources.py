@@ -0,0 +1,50 @@
+"""
+Shared Streamlit resources for the Rural Business Simulator pages
+"""
+
+from typing import TYPE_CHECKING
+
+import streamlit as st
+
+from config import AUCTION_SETTINGS
+from .database import DatabaseManager
+
+if TYPE_CHECKING:
+    from .ai_manager import AIManager
+
+
+@st.cache_resource
+def get_db() -> DatabaseManager:
+    """Return the process-wide database manager"""
+    return DatabaseManager()
+
+
+@st.cache_resource
+def get_ai(provider: str = "huggingface") -> "AIManager":
+    """Return a shared AI manager for the given provider, importing it on first use"""
+    from .ai_manager import AIManager
+    return AIManager(provider=provider)
+
+
+@st.cache_data(ttl=30)
+def cached_get_business(business_id: str):
+    """Cached read of a single business; clear after mutating it"""
+    return get_db().get_business(business_id)
+
+
+@st.cache_data(ttl=30)
+def cached_get_user_businesses(user_id: str):
+    """Cached read of a user's businesses; clear after mutating them"""
+    return get_db().get_user_businesses(user_id)
+
+
+@st.cache_data(ttl=AUCTION_SETTINGS["refresh_ttl"], show_spinner=False)
+def cached_get_active_auctions():
+    """Cached read of the active auctions; clear after bidding or creating one"""
+    return get_db().get_active_auctions()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_get_market_prices():
+    """Cached read of the admin market prices; clear after updating them"""
+    return get_db().get_market_prices()
@@ -0,0 +1,167 @@
+"""
+Shared page styles for the Rural Business Simulator
+
+Colors for built-in widgets come from the [theme] section of
+.streamlit/config.toml; these stylesheets only cover the custom HTML blocks.
+"""
+
+import streamlit as st
+
+_STYLESHEETS = {
+    "home": """
+        .main-header {
+            font-size: 2.5rem;
+            font-weight: bold;
+            color: #2E7D32;
+            text-align: center;
+            margin-bottom: 2rem;
+        }
+        .info-card {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            padding: 2rem;
+            border-radius: 10px;
+            color: white;
+            margin: 1rem 0;
+        }
+        .stButton>button {
+            background-color: #4CAF50;
+            color: white;
+            font-size: 1.1rem;
+            padding: 0.5rem 2rem;
+            border-radius: 5px;
+            border: none;
+        }
+        .stButton>button:hover {
+            background-color: #45a049;
+        }
+    """,
+    "business_setup": """
+        .business-card {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            padding: 1.5rem;
+            border-radius: 10px;
+            color: white;
+            margin: 1rem 0;
+        }
+        .resource-box {
+            background: #f0f2f6;
+            padding: 1rem;
+            border-radius: 8px;
+            margin: 0.5rem 0;
+        }
+        .business-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 1rem 0;
+        }
+        .business-table th, .business-table td {
+            padding: 0.6rem 1rem;
+            border-bottom: 1px solid #e0e0e0;
+            text-align: left;
+        }
+    """,
+    "game_scenarios": """
+        .scenario-box {
+            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+            padding: 2rem;
+            border-radius: 15px;
+            color: white;
+            font-size: 1.1rem;
+            margin: 1rem 0;
+        }
+        .option-button {
+            background: #ffffff;
+            padding: 1.5rem;
+            border-radius: 10px;
+            margin: 0.5rem 0;
+            border: 2px solid #ddd;
+            cursor: pointer;
+        }
+        .option-button:hover {
+            border-color: #4CAF50;
+            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+        }
+        .event-alert {
+            background: #ff9800;
+            padding: 1rem;
+            border-radius: 8px;
+            color: white;
+            margin: 1rem 0;
+        }
+        .score-card {
+            background: #4CAF50;
+            padding: 1.5rem;
+            border-radius: 10px;
+            color: white;
+            text-align: center;
+        }
+    """,
+    "auction_market": """
+        .auction-card {
+            background: #ffffff;
+            padding: 1.5rem;
+            border-radius: 10px;
+            border: 2px solid #e0e0e0;
+            margin: 1rem 0;
+        }
+        .auction-card:hover {
+            border-color: #4CAF50;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+        }
+        .live-badge {
+            background: #4CAF50;
+            color: white;
+            padding: 0.3rem 0.8rem;
+            border-radius: 20px;
+            font-size: 0.9rem;
+            font-weight: bold;
+        }
+        .closed-badge {
+            background: #9e9e9e;
+            color: white;
+            padding: 0.3rem 0.8rem;
+            border-radius: 20px;
+            font-size: 0.9rem;
+        }
+        .bid-btn {
+            background: #2196F3;
+            color: white;
+            padding: 0.5rem 1.5rem;
+            border-radius: 5px;
+            border: none;
+            font-size: 1rem;
+        }
+    """,
+    "admin_dashboard": """
+        .admin-header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            padding: 2rem;
+            border-radius: 10px;
+            color: white;
+            text-align: center;
+            margin-bottom: 2rem;
+        }
+        .stat-card {
+            background: #f8f9fa;
+            padding: 1.5rem;
+            border-radius: 10px;
+            border-left: 4px solid #4CAF50;
+        }
+        .data-table {
+            background: white;
+            padding: 1rem;
+            border-radius: 8px;
+        }
+    """
+}
+
+
+@st.cache_resource
+def _css(page: str) -> str:
+    """Build the <style> block for a page once per process"""
+    return f"<style>{_STYLESHEETS[page]}</style>"
+
+
+def inject_css(page: str):
+    """Inject the stylesheet for the given page"""
+    st.markdown(_css(page), unsafe_allow_html=True)